@@ -1,3 +1,237 @@
-from django.test import TestCase
+from datetime import datetime, timezone
+from decimal import Decimal
+import os
+import tempfile
+from unittest import mock
+import uuid
 
-# Create your tests here.
+from django.db import models
+from django.test import SimpleTestCase
+
+from immudb.datatypes import KeyValue, ReferenceRequest
+
+from immu_django.changes.checkpoints import Checkpoint
+from immu_django.exceptions import TableAlterError
+from immu_django.key_value.batches import ENTRY_OVERHEAD_BYTES, make_chunks, make_ops_chunks
+from immu_django.key_value.codecs import ValueCodec
+from immu_django.sql.getters import GetWhere
+from immu_django.sql.migrations import MigrationPlanner
+from immu_django import utils
+
+
+def make_field(field: models.Field, name: str) -> models.Field:
+    field.set_attributes_from_name(name)
+    return field
+
+
+def make_model(table_name: str):
+    return mock.Mock(immu_confs={'table_name': table_name, 'database': 'defaultdb'})
+
+
+def make_state(db_fields: list[str], indexes: list = None, fingerprint: str = 'new') -> dict:
+    return {
+        'model_name': 'Book',
+        'database': 'defaultdb',
+        'db_fields': db_fields,
+        'json_fields': [],
+        'indexes': indexes or [],
+        'fingerprint': fingerprint
+    }
+
+
+class ValueCodecTests(SimpleTestCase):
+    def test_encode_decode_round_trip(self):
+        codec = ValueCodec([
+            make_field(models.DecimalField(max_digits=10, decimal_places=2), 'price'),
+            make_field(models.DateTimeField(), 'created_at'),
+            make_field(models.UUIDField(), 'uuid')
+        ])
+        values = {
+            'price': Decimal('10.50'),
+            'created_at': datetime(2024, 1, 2, 10, 30, tzinfo=timezone.utc),
+            'uuid': uuid.uuid4()
+        }
+
+        decoded = codec.decode(codec.encode(values))
+
+        self.assertEqual(decoded, values)
+        self.assertIsInstance(decoded['price'], Decimal)
+        self.assertIsInstance(decoded['created_at'], datetime)
+        self.assertIsInstance(decoded['uuid'], uuid.UUID)
+
+    def test_decode_legacy_str_values(self):
+        codec = ValueCodec([make_field(models.UUIDField(null=True), 'uuid')])
+
+        self.assertEqual(codec.decode(b'{"uuid": "None"}'), {'uuid': None})
+
+
+class MakeChunksTests(SimpleTestCase):
+    def test_chunks_limited_by_entries(self):
+        objs = {f'key{i}'.encode(): b'value' for i in range(5)}
+
+        chunks = make_chunks(objs, max_entries=2)
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual({k: v for chunk in chunks for k, v in chunk.items()}, objs)
+
+    def test_chunks_limited_by_bytes(self):
+        objs = {b'a': b'1' * 10, b'b': b'2' * 10, b'c': b'3' * 10}
+        size = 1 + 10 + ENTRY_OVERHEAD_BYTES
+
+        chunks = make_chunks(objs, max_bytes=size * 2)
+
+        self.assertEqual([list(chunk) for chunk in chunks], [[b'a', b'b'], [b'c']])
+
+    def test_big_entry_has_its_own_chunk(self):
+        chunks = make_chunks({b'a': b'1' * 100}, max_bytes=10)
+
+        self.assertEqual(chunks, [{b'a': b'1' * 100}])
+
+    def test_ops_groups_are_not_split(self):
+        groups = [
+            [KeyValue(b'row1', b'1'), ReferenceRequest(b'index1', b'row1')],
+            [KeyValue(b'row2', b'2'), ReferenceRequest(b'index2', b'row2')],
+            [KeyValue(b'row3', b'3')]
+        ]
+
+        chunks = make_ops_chunks(groups, max_entries=3)
+
+        self.assertEqual(
+            [[op.key for op in chunk] for chunk in chunks],
+            [[b'row1', b'index1'], [b'row2', b'index2', b'row3']]
+        )
+
+
+class MakeKeyTests(SimpleTestCase):
+    def test_ulid_keys(self):
+        with mock.patch.object(utils, 'KEY_GENERATOR', 'ulid'):
+            keys = [utils.make_key() for _ in range(100)]
+
+        self.assertTrue(all(len(key) == 26 for key in keys))
+        self.assertTrue(all(set(key) <= set(utils._ULID_ALPHABET) for key in keys))
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_uuid7_keys(self):
+        with mock.patch.object(utils, 'KEY_GENERATOR', 'uuid7'):
+            keys = [utils.make_key() for _ in range(100)]
+
+        self.assertTrue(all(uuid.UUID(key).version == 7 for key in keys))
+        self.assertTrue(all(uuid.UUID(key).variant == uuid.RFC_4122 for key in keys))
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_key_with_prefix(self):
+        with mock.patch.object(utils, 'KEY_GENERATOR', 'ulid'):
+            key = utils.make_key('book@')
+
+        self.assertTrue(key.startswith('book@'))
+        self.assertEqual(len(key), len('book@') + 26)
+
+
+@mock.patch('immu_django.sql.migrations.get_migrations_names')
+@mock.patch('immu_django.sql.migrations.load_migration')
+@mock.patch('immu_django.sql.migrations.make_model_state')
+class MigrationPlannerTests(SimpleTestCase):
+    db_fields = ['id INTEGER AUTO_INCREMENT', 'name VARCHAR[256]', 'PRIMARY KEY (id)']
+
+    def make_planner(self, get_migrations_names, load_migration, old_state: dict = None, questioner = None):
+        get_migrations_names.return_value = ['0001_initial'] if old_state is not None else []
+        load_migration.return_value = {'state': {'app_book': old_state}}
+
+        return MigrationPlanner('app', [make_model('app_book')], questioner)
+
+    def test_new_table(self, make_model_state, load_migration, get_migrations_names):
+        make_model_state.return_value = make_state(self.db_fields, [[['name'], False]])
+        planner = self.make_planner(get_migrations_names, load_migration)
+
+        planner.plan()
+
+        self.assertEqual([op['operation'] for op in planner.operations], ['create_table', 'create_index'])
+        self.assertEqual(planner.operations[0]['db_fields'][-1], 'PRIMARY KEY (id)')
+
+    def test_same_fingerprint_has_no_operations(self, make_model_state, load_migration, get_migrations_names):
+        make_model_state.return_value = make_state(self.db_fields, fingerprint='old')
+        planner = self.make_planner(get_migrations_names, load_migration, make_state(self.db_fields, fingerprint='old'))
+
+        planner.plan()
+
+        self.assertEqual(planner.operations, [])
+
+    def test_new_nullable_field(self, make_model_state, load_migration, get_migrations_names):
+        make_model_state.return_value = make_state(self.db_fields[:-1] + ['pages INTEGER'] + self.db_fields[-1:])
+        planner = self.make_planner(get_migrations_names, load_migration, make_state(self.db_fields, fingerprint='old'))
+
+        planner.plan()
+
+        self.assertEqual(planner.operations, [{
+            'operation': 'add_column',
+            'table_name': 'app_book',
+            'database': 'defaultdb',
+            'db_field': 'pages INTEGER'
+        }])
+
+    def test_renamed_field(self, make_model_state, load_migration, get_migrations_names):
+        make_model_state.return_value = make_state(['id INTEGER AUTO_INCREMENT', 'title VARCHAR[256]', 'PRIMARY KEY (id)'])
+        planner = self.make_planner(
+            get_migrations_names, load_migration, make_state(self.db_fields, fingerprint='old'), lambda txt: True
+        )
+
+        planner.plan()
+
+        self.assertEqual([op['operation'] for op in planner.operations], ['rename_column'])
+        self.assertEqual(planner.operations[0]['old_name'], 'name')
+        self.assertEqual(planner.operations[0]['new_name'], 'title')
+
+    def test_not_null_field_and_removed_field_are_errors(self, make_model_state, load_migration, get_migrations_names):
+        make_model_state.return_value = make_state(['id INTEGER AUTO_INCREMENT', 'pages INTEGER NOT NULL', 'PRIMARY KEY (id)'])
+        planner = self.make_planner(get_migrations_names, load_migration, make_state(self.db_fields, fingerprint='old'))
+
+        with self.assertRaises(TableAlterError):
+            planner.plan()
+
+        self.assertEqual(len(planner.errors), 2)
+
+
+class GetProjectionTests(SimpleTestCase):
+    def setUp(self):
+        immu_client = mock.Mock()
+        immu_client.sqlQuery.return_value = [
+            ('app_book', 'id', 'INTEGER', 8, False, True, True, True, True),
+            ('app_book', 'name', 'VARCHAR', 256, True, False, False, False, False)
+        ]
+
+        self.getter = GetWhere('defaultdb', 'app_book', immu_client)
+
+    def test_model_without_projection(self):
+        self.assertEqual(self.getter._get_projection(), ('model', None))
+
+    def test_only_adds_the_primary_keys(self):
+        self.assertEqual(self.getter._get_projection(only=['name']), ('only', ['id', 'name']))
+        self.assertEqual(self.getter._get_projection(only=['name', 'id']), ('only', ['name', 'id']))
+
+    def test_values_and_values_list(self):
+        self.assertEqual(self.getter._get_projection(values=['name']), ('values', ['name']))
+        self.assertEqual(self.getter._get_projection(values_list=('name',)), ('values_list', ['name']))
+
+    def test_projections_cant_be_used_together(self):
+        with self.assertRaises(ValueError):
+            self.getter._get_projection(only=['name'], values=['name'])
+
+
+class CheckpointTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_starts_at_zero(self):
+        self.assertEqual(Checkpoint('search', self.directory.name).get('defaultdb'), 0)
+
+    def test_set_is_loaded_by_a_new_checkpoint(self):
+        Checkpoint('search', self.directory.name).set('defaultdb', 42)
+
+        checkpoint = Checkpoint('search', self.directory.name)
+
+        self.assertEqual(checkpoint.get('defaultdb'), 42)
+        self.assertEqual(checkpoint.get('otherdb'), 0)
+        self.assertEqual(os.listdir(self.directory.name), ['search.json'])
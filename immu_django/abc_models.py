@@ -1,22 +1,39 @@
-import json
-from typing import Dict
+from contextlib import contextmanager
+from typing import Dict, Iterator
 from django.db import models
 from django.apps import apps
 
-from immudb.datatypes import DeleteKeysRequest
+from immudb.datatypes import DeleteKeysRequest, KeyValue, ReferenceRequest, ZAddRequest
 
+from immu_django.atomics import ImmuAtomic, get_active_atomic, reset_active_atomic, set_active_atomic
 from immu_django.connection import starting_db
-from immu_django.key_value.constants import IMMU_CONFS_BASE_KEY_VALUE
+from immu_django.exceptions import TableAlterError
+from immu_django.key_value.batches import exec_all_in_chunks, set_all_in_chunks
+from immu_django.key_value.codecs import ValueCodec
+from immu_django.key_value.constants import BATCH_PARALLEL, IMMU_CONFS_BASE_KEY_VALUE, KEY_NAMESPACES, NOT_FIELDS_VALUES
+from immu_django.key_value.indexes import RANGE_INDEX_PREFIX, is_index_entry, make_index_prefix, make_index_refs, make_range_zadds, make_score, scan_index
 
-from immu_django.key_value.getters import get_obj_common_infos, \
+from immu_django.key_value.getters import HistoryEntry, \
+decode_value, \
+get_all_entries, \
+get_obj_common_infos, \
 make_obj_after_other_obj, \
 make_obj_with_tx, \
+get_obj_data_at_tx, \
 get_only_verified_obj, \
+get_or_none, \
+history_entries, \
 make_objs_history_for_a_key, \
-make_objs_on_collection
+make_objs_on_collection, \
+make_objs_on_collection_at_tx, \
+scan_entries, \
+verified_get_or_none, \
+zscan_entries
 
 from immu_django.key_value.setters import auth_and_get_get_fields, \
 encode_all_objs_key_value_to_saving_in_multiple, \
+make_refs_and_collections_ops, \
+save_obj_with_indexes, \
 get_all_objs_key_value_in_multiple, \
 save_obj_in_database_to_unique, \
 set_collections_to_unique, \
@@ -24,13 +41,21 @@ set_not_verified_refs_and_collections_in_multiple, \
 set_refs_to_unique, \
 set_verified_refs_and_collections_in_multiple
 
-from immu_django.sql.alter import TableAlter
+from immu_django.replicas.models import make_replica_model
+
+from immu_django.snapshots import ImmuSnapshot, get_active_snapshot, reset_active_snapshot, set_active_snapshot
+
+from immu_django.sql.alter import InlineJsonMigrator, TableAlter
+from immu_django.sql.constants import AUTO_MIGRATE
 from immu_django.sql.creators import TableCreator
+from immu_django.sql.fingerprints import get_schema_fingerprint, make_schema_fingerprint, reload_schema_fingerprint, set_schema_fingerprint
 from immu_django.sql.getters import GetWhere
+from immu_django.sql.jsons import save_jsons
 from immu_django.sql.models import SQLModel
+from immu_django.sql.sessions import get_active_session, reset_active_session, sessions_pool, set_active_session, sql_exec_in_transaction
 from immu_django.sql.setters import InsertMaker
 
-from immu_django.utils import lowercase_and_add_space, random_key
+from immu_django.utils import lowercase_and_add_space, make_key
 
 
 immu_client = starting_db()
@@ -41,6 +66,166 @@ databases = immu_client.databaseList()
 """
 List of all databases inside your immudb
 """
+immu_key_value_models = []
+"""
+List of all models decorated with immu_key_value_class
+"""
+immu_sql_models = []
+"""
+List of all models decorated with immu_sql_class
+"""
+
+
+@contextmanager
+def immu_snapshot(tx_id: int = None, database: str = IMMU_CONFS_BASE_KEY_VALUE['database']):
+    """
+        INFO:
+            Pin every read inside the context to one transaction of the database.
+            
+        USE:
+            with immu_snapshot() as snap:\n
+                user = User.get(id=1)\n
+                score = Score.get(key_or_ref='user_1')\n
+            \n
+            SQL reads use 'BEFORE TX' and key/value reads are resolved at the snapshot transaction,\n
+            the results are cached inside the snapshot so repeated reads don't go to the server.\n
+            Other databases are pinned to their current transaction the first time they are read inside the context.
+            
+        ALERT:
+            Writes inside the context are not visible to the reads of the context,\n
+            'all' and 'starts_with' can't see keys that were deleted after the snapshot transaction.
+    
+        Args:
+            tx_id (int): transaction id of the snapshot, default is the current transaction of the database,\n
+            database (str): database of the given transaction id
+            
+        Yields:
+            ImmuSnapshot: the snapshot of the context
+    """
+    
+    immu_client.useDatabase(database)
+    
+    if tx_id is None:
+        tx_id = immu_client.currentState().txId
+        
+    token = set_active_snapshot(ImmuSnapshot({database: tx_id}))
+    
+    try:
+        yield get_active_snapshot()
+    finally:
+        reset_active_snapshot(token)
+
+
+@contextmanager
+def immu_atomic(database: str = None):
+    """
+        INFO:
+            Commit the writes of key/value and sql models inside the context together when it ends.
+            
+        USE:
+            with immu_atomic(database='orders'):\n
+                order = Order.create(id=1)\n
+                OrderLine.create_mult([{'order': order, 'number': 1}, {'order': order, 'number': 2}])\n
+                Audit.create(key='order_1', action='created')\n
+            \n
+            The sql inserts and upserts of a database are commited inside one sql transaction,\n
+            the key/value rows, refs and scores of a database inside one execAll transaction.\n
+            If the context raises nothing is written, immu_atomic inside another immu_atomic joins it.
+            
+        ALERT:
+            Writes inside the context are not visible to the reads of the context.\n
+            immudb can't put sql and key/value writes inside the same transaction, a database with both has two transactions.\n
+            Key/value models with expireableDateTime and 'delete' can't be used inside the context.
+    
+        Args:
+            database (str): only database that can be written inside the context, so the context is one transaction
+            
+        Yields:
+            ImmuAtomic: the queued writes, 'tx_ids' has the transaction ids of each database after the context
+    """
+    
+    if get_active_atomic() is not None:
+        yield get_active_atomic()
+        return
+    
+    atomic = ImmuAtomic(database)
+    token = set_active_atomic(atomic)
+    
+    try:
+        yield atomic
+    finally:
+        reset_active_atomic(token)
+    
+    atomic.tx_ids = atomic.commit(immu_client)
+
+
+@contextmanager
+def immu_sql_session(database: str = IMMU_CONFS_BASE_KEY_VALUE['database'], read_only: bool = False):
+    """
+        INFO:
+            Use an interactive sql session of immudb for the sql models of the database inside the context.
+            
+        USE:
+            with immu_sql_session(database='orders'):\n
+                order = Order.create(id=1)\n
+                lines = OrderLine.filter(order_id=1)\n
+                order.status = 'open'\n
+                order.save()\n
+            \n
+            Every sql read and write of the models of the database inside the context is part of one server side transaction,\n
+            it's commited when the context ends and rolled back if it raises, the reads see the writes of the context.\n
+            The sessions are kept inside a pool (IMMU_SQL_SESSIONS_POOL_SIZE per database) and reused by the next contexts.
+            
+        ALERT:
+            Key/value models, the json fields stored inside 'jsonsqlfields' and the sql of other databases don't use the session.\n
+            A session is used by one context at a time, immu_sql_session inside another of the same database joins it.
+    
+        Args:
+            database (str): database of the session,\n
+            read_only (bool): open a read only transaction
+            
+        Yields:
+            ImmuSQLSession: the session of the context
+    """
+    
+    active_session = get_active_session()
+    
+    if active_session is not None and active_session.database == database:
+        yield active_session
+        return
+    
+    session = sessions_pool.acquire(database)
+    
+    try:
+        session.begin(read_only)
+    except Exception:
+        sessions_pool.discard(session)
+        raise
+    
+    token = set_active_session(session)
+    
+    try:
+        yield session
+    except BaseException:
+        reset_active_session(token)
+        
+        try:
+            session.rollback()
+        except Exception:
+            sessions_pool.discard(session)
+        else:
+            sessions_pool.release(session)
+        raise
+    
+    reset_active_session(token)
+    
+    try:
+        session.commit()
+    except Exception:
+        sessions_pool.discard(session)
+        raise
+    
+    sessions_pool.release(session)
 
 
 def immu_key_value_class(cls):
@@ -64,6 +249,28 @@ def immu_key_value_class(cls):
     if cls.immu_confs['database'] not in databases:
         immu_client.createDatabase(cls.immu_confs['database'])
         
+    # COMPILING THE ENCODER OF THE VALUES
+    cls.immu_codec = ValueCodec(cls._meta.fields)
+        
+    # VERIFYING THE INDEXED FIELDS
+    fields_names = [field.name for field in cls._meta.fields if field.name not in NOT_FIELDS_VALUES]
+    
+    indexed_fields = cls.immu_confs.get('indexes', []) + cls.immu_confs.get('range_indexes', [])
+    
+    for field in indexed_fields:
+        if field not in fields_names:
+            raise ValueError(f'Indexed field {field} is not a field of {cls.__name__}')
+    
+    if len(indexed_fields) > 0 and cls.immu_confs['expireableDateTime'] is not None:
+        raise ValueError(f"Indexes of {cls.__name__} can't be used with expireableDateTime")
+        
+    # NAMESPACING THE KEYS OF THE MODEL
+    if cls.immu_confs.get('namespace') is None and KEY_NAMESPACES:
+        app_label = apps.get_containing_app_config(cls.__module__).label
+        cls.immu_confs['namespace'] = f'@{app_label}_{lowercase_and_add_space(cls.__name__)}@'
+        
+    immu_key_value_models.append(cls)
+        
     return cls
 
 class ImmudbKeyField(models.Model):
@@ -80,7 +287,12 @@ class ImmudbKeyField(models.Model):
             models.FloatField,\n
             models.JsonField,\n
             models.CharField,\n
-            models.BooleanField
+            models.BooleanField,\n
+            models.DecimalField,\n
+            models.DateTimeField,\n
+            models.DateField,\n
+            models.TimeField,\n
+            models.UUIDField
             
         ALERT:
             Don't overwrite Meta class.\n
@@ -92,7 +304,7 @@ class ImmudbKeyField(models.Model):
     # ABC VARS
     verified = models.BooleanField(default=False)
     create_multi = models.JSONField(null=True, blank=True)
-    key = models.CharField(max_length=255, default=random_key(immu_client))
+    key = models.CharField(max_length=255, blank=True)
     
     immu_confs = IMMU_CONFS_BASE_KEY_VALUE
     """
@@ -105,7 +317,13 @@ class ImmudbKeyField(models.Model):
                 'hours': hours (int),
                 'days': days (int)
             }): 
-            database (str): name of the database to ultilized for the class
+            database (str): name of the database to ultilized for the class,\n
+            key_prefix (str): prefix of the keys made for the rows created without key,\n
+            namespace (str): prefix put inside immudb before every key and reference of the model, so the scans of the model only read its keys,\n
+                if not given and IMMU_KEY_NAMESPACES is True inside the settings it's '@app_model@',\n
+            indexes (list[str]): fields with an equality index, used by 'find', the index entries are written inside the same transaction of the row,\n
+            range_indexes (list[str]): numeric or date fields with a range index (a sorted set per field), used by 'range', written inside the same transaction of the row,\n
+                verified rows of models with indexes are not verified writes, they are verified by reading them back after the write
     """
     
     # CONFIG METHODS     
@@ -117,6 +335,56 @@ class ImmudbKeyField(models.Model):
         abstract = True
         managed = False
         
+    
+    @classmethod
+    def make_key(cls) -> str:
+        """
+            Make a new time ordered key with the 'key_prefix' of the immu_confs
+            
+            Returns:
+                str: the key
+        """
+        
+        return make_key(cls.immu_confs.get('key_prefix', ''))
+    
+    
+    @classmethod
+    def _to_immu_key(cls, key: str) -> str:
+        return f"{cls.immu_confs.get('namespace') or ''}{key}"
+    
+    
+    @classmethod
+    def _get_range_prefix(cls) -> str:
+        namespace = cls.immu_confs.get('namespace') or ''
+        
+        return f'{namespace}{RANGE_INDEX_PREFIX}{cls._meta.app_label}_{lowercase_and_add_space(cls.__name__)}@'
+    
+    
+    @classmethod
+    def _make_index_ops(cls, key: bytes, values: dict) -> list:
+        refs = make_index_refs(
+            cls.immu_confs.get('namespace') or '', 
+            cls.immu_confs.get('indexes', []), 
+            key, values
+        )
+        zadds = make_range_zadds(
+            cls._get_range_prefix(), 
+            cls.immu_confs.get('range_indexes', []), 
+            key, values
+        )
+        
+        return refs + zadds
+    
+    
+    @classmethod
+    def _from_immu_key(cls, key: str) -> str:
+        namespace = cls.immu_confs.get('namespace') or ''
+        
+        if namespace and key.startswith(namespace):
+            return key[len(namespace):]
+        
+        return key
+        
 
     def save(self, *args, **kwargs):
         """
@@ -136,10 +404,28 @@ class ImmudbKeyField(models.Model):
             return
                 
         # PREPARE ALL THE DATA FOR CREATION
-        json_values = json.dumps(values).encode()
-        key_pk = self.key.encode()
-                
-        save_obj_in_database_to_unique(self, immu_client, key_pk, json_values)
+        if not self.key:
+            self.key = self.make_key()
+        
+        json_values = self.immu_codec.encode(values)
+        key_pk = self._to_immu_key(self.key).encode()
+        
+        index_ops = self._make_index_ops(key_pk, values)
+        atomic = get_active_atomic()
+        
+        if atomic is not None:
+            if self.immu_confs['expireableDateTime'] is not None:
+                raise ValueError(f"{type(self).__name__} with expireableDateTime can't be saved inside immu_atomic")
+            
+            atomic.add_key_values(
+                self.immu_confs['database'], 
+                [KeyValue(key=key_pk, value=json_values), *index_ops], 
+                [key_pk] if self.verified else None
+            )
+        elif len(index_ops) > 0:
+            save_obj_with_indexes(self, immu_client, key_pk, json_values, index_ops)
+        else:
+            save_obj_in_database_to_unique(self, immu_client, key_pk, json_values)
     
     
     @classmethod
@@ -155,80 +441,216 @@ class ImmudbKeyField(models.Model):
     
     
     # SETTERS
+    @classmethod
+    def _get_obj_data(cls, key: bytes, only_verified: bool):
+        snapshot = get_active_snapshot()
+        
+        if snapshot is None:
+            if only_verified:
+                return immu_client.verifiedGet(key)
+            
+            return immu_client.get(key)
+        
+        tx_id = snapshot.get_tx_id(immu_client, cls.immu_confs['database'])
+        
+        def make():
+            if only_verified:
+                obj_data = verified_get_or_none(immu_client, key)
+            else:
+                obj_data = get_or_none(immu_client, key)
+            
+            return get_obj_data_at_tx(immu_client, obj_data, tx_id, only_verified)
+        
+        return snapshot.get_cached((cls.immu_confs['database'], key, only_verified), make)
+
+    @classmethod
+    def _scan(cls, key: bytes, prefix: bytes, reverse: bool, size_limit: int) -> dict[bytes, bytes]:
+        snapshot = get_active_snapshot()
+        
+        if snapshot is not None:
+            tx_id = snapshot.get_tx_id(immu_client, cls.immu_confs['database'])
+        
+        def make():
+            scan = {}
+            seek_key = key
+            
+            while len(scan) < size_limit:
+                entries = scan_entries(immu_client, seek_key, prefix, reverse, size_limit)
+                
+                for entry in entries:
+                    # Index entries of models without namespace are inside the prefix, the rows are read by their own keys
+                    if is_index_entry(entry):
+                        continue
+                    
+                    obj_data = entry if snapshot is None else get_obj_data_at_tx(immu_client, entry, tx_id)
+                    
+                    if obj_data is not None:
+                        scan[obj_data.key] = obj_data.value
+                    
+                    if len(scan) >= size_limit:
+                        break
+                
+                if len(entries) < size_limit:
+                    break
+                
+                seek_key = entries[-1].referencedBy.key if entries[-1].HasField('referencedBy') else entries[-1].key
+            
+            return scan
+        
+        if snapshot is None:
+            return make()
+        
+        return snapshot.get_cached((cls.immu_confs['database'], 'scan', key, prefix, reverse, size_limit), make)
+
     @classmethod
     def create(cls, *,
-               key: str, verified: bool = False,
+               key: str = None, verified: bool = False,
                refs: list[str] = None, 
                collection_scores: Dict[str, float] = None,
-               **kwargs):
+               **kwargs) -> str:
         """
             Create an key value row inside the immudb database
             
             Kwargs:
-                key (str) NOT NULL: key for the index the row,\n
+                key (str): key for the index the row, a new time ordered key is made if not given,\n
                 verified (bool): set row as verified or not inside the db,\n
                 refs (list[str]): set the references for the row,\n
                 collection_scores (dict[str, float]): set the collection for the row and a score of the row,\n
                 kwargs (kwargs) NOT NULL: values for make the value for the row
                 
             Returns:
-                None
+                str: key of the row
         """
         
         cls.on_call()
         
+        if key is None:
+            key = cls.make_key()
+        
         # CREATE OBJECT ON IMMU DATABASE
         cls.objects.create(key=key, verified=verified,**kwargs)
         
-        set_refs_to_unique(immu_client, key, refs, verified)
+        immu_key = cls._to_immu_key(key)
+        
+        if refs is not None:
+            refs = [cls._to_immu_key(ref) for ref in refs]
         
-        set_collections_to_unique(immu_client, key, collection_scores, verified)
+        atomic = get_active_atomic()
+        
+        if atomic is not None:
+            atomic.add_key_values(cls.immu_confs['database'], make_refs_and_collections_ops(immu_key, refs, collection_scores))
+            return key
+        
+        set_refs_to_unique(immu_client, immu_key, refs, verified)
+        
+        set_collections_to_unique(immu_client, immu_key, collection_scores, verified)
+        
+        return key
         
         
     @classmethod
-    def create_mult(cls, *, obj_list: list[dict[str, dict, list[str], dict[str, float]]] = None):
+    def create_mult(cls, *, obj_list: list[dict[str, dict, list[str], dict[str, float]]] = None,
+                    parallel: bool = BATCH_PARALLEL) -> dict:
         """
-            Create multiples objects inside the immu database in one transaction.
+            Create multiples objects inside the immu database in one transaction per chunk.
             
             ALERT:
                 Using this method 'expireableDateTime' in immu_confs atribute is not not applied.\n
-                Only rows with references can be set as verified.
+                Only rows with references can be set as verified.\n
+                Big lists are split in chunks by size (IMMU_BATCH_MAX_BYTES) and number of rows (IMMU_BATCH_MAX_ENTRIES),\n
+                if a chunk fails a BatchWriteError is raised with the written and failed chunks, the written ones are kept.
                 
             Args:
                 obj_list ({
-                    key (str) NOT NULL: key for the index the row,\n
+                    key (str): key for the index the row, a new time ordered key is made if not given,\n
                     values (dict) NOT NULL: values for make the value for the row,\n
                     verified (bool): set row as verified or not inside the db,\n
                     refs (list[str]): set the references for the row,\n
                     collection_scores (dict[str, float]): set the collection for the row and a score of the row,\n
-                }) NOT NULL: list of kwargs(dict) for make an trasaction with multiple rows inside the database
+                }) NOT NULL: list of kwargs(dict) for make an trasaction with multiple rows inside the database,\n
+                parallel (bool): send the chunks at the same time
                             
             Returns:
-                None
+                dict({
+                    tx_ids (list[int]): transaction ids of the chunks,\n
+                    first_tx (int | None): first transaction id,\n
+                    last_tx (int | None): last transaction id,\n
+                    chunks (int): number of chunks
+                }): transactions of the rows
         """
         
         cls.on_call()
         
+        for obj in obj_list:
+            if obj.get('key') is None:
+                obj['key'] = cls.make_key()
+        
         try:
             # AUTH ALL OBJECTS
             objs = get_all_objs_key_value_in_multiple(obj_list)
                 
-            cls.objects.create(create_multi=objs)
+            objs = cls.immu_codec.validate_many(objs)
         except Exception:
             raise ValueError('Error while trying to create_mult')
         else:
-            objs = encode_all_objs_key_value_to_saving_in_multiple(objs)
+            values = {cls._to_immu_key(key).encode(): value for key, value in objs.items()}
+            objs = encode_all_objs_key_value_to_saving_in_multiple({
+                key.decode(): value for key, value in values.items()
+            }, cls.immu_codec)
+            
+            atomic = get_active_atomic()
+            
+            if atomic is not None:
+                return cls._add_mult_to_atomic(atomic, obj_list, objs, values)
             
             # CREATE THE OBJECTS ON IMMU DATABASE
-            immu_client.setAll(objs)
+            if len(cls.immu_confs.get('indexes', []) + cls.immu_confs.get('range_indexes', [])) > 0:
+                written = exec_all_in_chunks(immu_client, [
+                    [KeyValue(key=key, value=value), *cls._make_index_ops(key, values[key])]
+                    for key, value in objs.items()
+                ], parallel=parallel)
+            else:
+                written = set_all_in_chunks(immu_client, objs, parallel=parallel)
             
             # SET ALL REFS AND COLLECTIONS ON IMMU DATASE
             for obj in obj_list:
+                obj = {**obj, 'key': cls._to_immu_key(obj['key'])}
+                
+                if 'refs' in obj:
+                    obj['refs'] = [cls._to_immu_key(ref) for ref in obj['refs']]
+                
                 if 'verified' in obj and obj['verified']:
                     set_verified_refs_and_collections_in_multiple(immu_client, obj)
                 else:  
                     set_not_verified_refs_and_collections_in_multiple(immu_client, obj)
                     
+            return written
+    
+    
+    @classmethod
+    def _add_mult_to_atomic(cls, atomic: ImmuAtomic, obj_list: list[dict], objs: dict[bytes, bytes], values: dict[bytes, dict]) -> dict:
+        if cls.immu_confs['expireableDateTime'] is not None:
+            raise ValueError(f"{cls.__name__} with expireableDateTime can't be created inside immu_atomic")
+        
+        ops = []
+        verified_keys = []
+        
+        for obj in obj_list:
+            key = cls._to_immu_key(obj['key'])
+            refs = [cls._to_immu_key(ref) for ref in obj.get('refs', [])]
+            
+            ops.append(KeyValue(key=key.encode(), value=objs[key.encode()]))
+            ops.extend(cls._make_index_ops(key.encode(), values[key.encode()]))
+            ops.extend(make_refs_and_collections_ops(key, refs, obj.get('collection_scores')))
+            
+            if obj.get('verified'):
+                verified_keys.append(key.encode())
+        
+        atomic.add_key_values(cls.immu_confs['database'], ops, verified_keys)
+        
+        # The transaction is only known when the immu_atomic ends
+        return {'tx_ids': [], 'first_tx': None, 'last_tx': None, 'chunks': 0}
+                    
                     
     @classmethod
     def set_ref(cls, *, key: str, ref_key: str, verified: bool = False):
@@ -246,10 +668,16 @@ class ImmudbKeyField(models.Model):
         
         cls.on_call()
         
-        if verified:
-            immu_client.verifiedSetReference(key.encode(), ref_key.encode())
+        key = cls._to_immu_key(key).encode()
+        ref_key = cls._to_immu_key(ref_key).encode()
+        atomic = get_active_atomic()
+        
+        if atomic is not None:
+            atomic.add_key_values(cls.immu_confs['database'], [ReferenceRequest(key=ref_key, referencedKey=key)])
+        elif verified:
+            immu_client.verifiedSetReference(key, ref_key)
         else:
-            immu_client.setReference(key.encode(), ref_key.encode())
+            immu_client.setReference(key, ref_key)
             
     
     @classmethod
@@ -268,7 +696,15 @@ class ImmudbKeyField(models.Model):
         
         cls.on_call()
         
-        immu_client.zAdd(collection, key, score)
+        atomic = get_active_atomic()
+        
+        if atomic is not None:
+            atomic.add_key_values(cls.immu_confs['database'], [
+                ZAddRequest(set=collection.encode(), score=score, key=cls._to_immu_key(key).encode())
+            ])
+            return
+        
+        immu_client.zAdd(collection.encode(), score, cls._to_immu_key(key).encode())
                     
                     
     # DELETTER                     
@@ -286,8 +722,11 @@ class ImmudbKeyField(models.Model):
         
         cls.on_call()
         
+        if get_active_atomic() is not None:
+            raise ValueError(f"{cls.__name__}.delete can't be used inside immu_atomic")
+        
         # SET THE REQUEST FOR SET OBJECT AS DELETED INSIDE THE IMMU DATABASE
-        deleteRequest = DeleteKeysRequest(keys=[key.encode()])
+        deleteRequest = DeleteKeysRequest(keys=[cls._to_immu_key(key).encode()])
         
         return immu_client.delete(deleteRequest)
 
@@ -317,45 +756,190 @@ class ImmudbKeyField(models.Model):
         
         cls.on_call()
         
-        obj_data = immu_client.verifiedGetSince(key.encode(), tx_id + step)
+        obj_data = immu_client.verifiedGetSince(cls._to_immu_key(key).encode(), tx_id + step)
 
         if obj_data:
-            return make_obj_after_other_obj(obj_data)
+            obj_dict = make_obj_after_other_obj(obj_data, cls.immu_codec)
+            obj_dict['key'] = cls._from_immu_key(obj_dict['key'])
+            
+            return obj_dict
 
 
     @classmethod
-    def all(cls, *, size_limit: int = 1_000, reverse: bool = True) -> dict[str, str]:
+    def all(cls, *, size_limit: int = 1_000, reverse: bool = True, raw: bool = False) -> dict[str, dict | bytes]:
         """
             Get all objects inside the immu database
             
             Kwargs:
                 size_limit (int): limit the size of given rows,\n
-                reverse (int): reverse the order
+                reverse (int): reverse the order,\n
+                raw (bool): give the values as stored bytes, without decoding
             
             Returns:
-                dict(key (str): value (dict)): returns a dict of key/value
+                dict(key (str): value (dict | bytes)): returns a dict of key/value
+        """
+        
+        cls.on_call()
+        
+        scan = cls._scan(b'', cls._to_immu_key('').encode(), reverse, size_limit)
+        
+        return {cls._from_immu_key(key.decode()): decode_value(value, raw, cls.immu_codec) for key, value in scan.items()}
+
+
+    @classmethod
+    def find(cls, *, size_limit: int = 1_000, raw: bool = False, **kwargs) -> dict[str, dict | bytes]:
+        """
+            Get the objects that have the given values using the indexes of the model
+            
+            USE:
+                ExampleModel.find(status='open')\n
+                At least one of the given fields must be inside the 'indexes' of the immu_confs,\n
+                the other fields are compared with the values of the rows found by the index.
+            
+            Kwargs:
+                size_limit (int): limit the size of given rows,\n
+                raw (bool): give the values as stored bytes, without decoding,\n
+                kwargs (kwargs) NOT NULL: values of the fields of the rows
+            
+            Returns:
+                dict(key (str): value (dict | bytes)): returns a dict of key/value
         """
         
         cls.on_call()
         
-        scan = immu_client.scan(b'', b'', reverse, size_limit)
+        indexes = cls.immu_confs.get('indexes', [])
+        indexed_fields = [field for field in kwargs if field in indexes]
+        
+        if len(indexed_fields) == 0:
+            raise ValueError(f'find needs at least one of the indexed fields of {cls.__name__}: {indexes}')
+        
+        # Same types as the saved values, so the index strings match
+        values = {field: str(value) for field, value in cls.immu_codec.to_python(kwargs).items()}
+        prefix = make_index_prefix(
+            cls.immu_confs.get('namespace') or '', 
+            indexed_fields[0], values[indexed_fields[0]]
+        )
+        
+        objs = {}
         
-        return {key.decode(): json.loads(value.decode()) for key, value in scan.items()}
+        for entry in scan_index(immu_client, prefix):
+            key = cls._from_immu_key(entry.key.decode())
+            
+            if key in objs:
+                continue
+            
+            value = cls.immu_codec.decode(entry.value)
+            
+            # Index entries of old values still reference the last value of the row
+            if any(str(value.get(field)) != field_value for field, field_value in values.items()):
+                continue
+            
+            objs[key] = entry.value if raw else value
+            
+            if len(objs) >= size_limit:
+                break
+        
+        return objs
 
 
     @classmethod
-    def get(cls, *, key_or_ref: str, only_verified: bool = False) -> dict:
+    def range(cls, *, field: str, 
+              gt: float = None, gte: float = None, 
+              lt: float = None, lte: float = None,
+              order: str = 'asc', size_limit: int = 1_000, 
+              raw: bool = False) -> list[dict]:
+        """
+            Get the objects with the field value inside the given range using the range index of the field
+            
+            USE:
+                ExampleModel.range(field='amount', gt=100, order='desc')\n
+                ExampleModel.range(field='created_at', gte=now() - timedelta(days=1))\n
+                The field must be inside the 'range_indexes' of the immu_confs, dates can be used as limits.
+            
+            Kwargs:
+                field (str) NOT NULL: range indexed field,\n
+                gt (float | datetime): get only rows with the field greater than,\n
+                gte (float | datetime): get only rows with the field greater than or equal,\n
+                lt (float | datetime): get only rows with the field less than,\n
+                lte (float | datetime): get only rows with the field less than or equal,\n
+                order (str): 'asc' or 'desc' order of the field,\n
+                size_limit (int): limit the size of given rows,\n
+                raw (bool): give the values as stored bytes, without decoding
+            
+            Returns:
+                list[
+                    dict({
+                        key (str): key of the row,\n
+                        value (dict | bytes): value of the row,\n
+                        score (float): value of the field inside the index (timestamp for dates)
+                    })
+                ]: rows in the order of the field
+        """
+        
+        cls.on_call()
+        
+        if field not in cls.immu_confs.get('range_indexes', []):
+            raise ValueError(f'{field} is not inside the range_indexes of {cls.__name__}')
+        
+        min_score = make_score(gte if gte is not None else gt)
+        max_score = make_score(lte if lte is not None else lt)
+        gt, lt = make_score(gt), make_score(lt)
+        
+        objs = []
+        keys = set()
+        seek_entry = None
+        
+        while len(objs) < size_limit:
+            entries = zscan_entries(
+                immu_client, f'{cls._get_range_prefix()}{field}'.encode(), 
+                seek_entry, 0, order == 'desc', 1_000,
+                min_score, max_score
+            )
+            
+            for entry in entries:
+                # Exclusive limits and repeated keys, the sorted set keeps the scores of the old values
+                if (gt is not None and entry.score <= gt) \
+                    or (lt is not None and entry.score >= lt) \
+                    or entry.key in keys:
+                    continue
+                
+                value = cls.immu_codec.decode(entry.entry.value)
+                
+                if make_score(value.get(field)) != entry.score:
+                    continue
+                
+                keys.add(entry.key)
+                objs.append({
+                    'key': cls._from_immu_key(entry.key.decode()),
+                    'value': entry.entry.value if raw else value,
+                    'score': entry.score
+                })
+                
+                if len(objs) >= size_limit:
+                    break
+            
+            if len(entries) < 1_000:
+                break
+            
+            seek_entry = entries[-1]
+            
+        return objs
+
+
+    @classmethod
+    def get(cls, *, key_or_ref: str, only_verified: bool = False, raw: bool = False) -> dict:
         """
             Get the last saved row given the key or reference
             
             Kwargs:
                 key_or_ref (str) NOT NULL: index key or reference key of the row,\n
-                only_verified (bool): get only verified row
+                only_verified (bool): get only verified row,\n
+                raw (bool): give the value as stored bytes, without decoding
             
             Returns:
                 dict({
                     key (str): key of the row,\n
-                    value (dict): value of the row,\n
+                    value (dict | bytes): value of the row,\n
                     tx_id (int): transaction id of the row,\n
                     revision (int): revision of the transaction of the row,\n
                     verified (bool) IF VERIFIED: True if the row is verified,\n
@@ -368,19 +952,77 @@ class ImmudbKeyField(models.Model):
         
         obj_dict = {}
         
-        if only_verified:
-            obj_data = immu_client.verifiedGet(key_or_ref.encode())
-            
-            get_only_verified_obj(obj_dict, obj_data)
-        else:
-            obj_data = immu_client.get(key_or_ref.encode())
+        obj_data = cls._get_obj_data(cls._to_immu_key(key_or_ref).encode(), only_verified)
             
         if obj_data:
-            get_obj_common_infos(obj_dict, obj_data)
+            if only_verified:
+                get_only_verified_obj(obj_dict, obj_data)
+            
+            get_obj_common_infos(obj_dict, obj_data, raw, cls.immu_codec)
+            obj_dict['key'] = cls._from_immu_key(obj_dict['key'])
             
             return obj_dict
 
 
+    @classmethod
+    def get_many(cls, *, keys_or_refs: list[str], only_verified: bool = False) -> dict[str, dict | None]:
+        """
+            Get the last saved rows of multiple keys or references at once
+            
+            Kwargs:
+                keys_or_refs (list[str]) NOT NULL: index keys or reference keys of the rows,\n
+                only_verified (bool): get only verified rows, the rows are verified one at a time
+            
+            Returns:
+                dict(key_or_ref (str): dict({
+                    key (str): key of the row,\n
+                    value (dict): value of the row,\n
+                    tx_id (int): transaction id of the row,\n
+                    revision (int): revision of the transaction of the row,\n
+                    verified (bool) IF VERIFIED: True if the row is verified,\n
+                    timestamp (int) IF VERIFIED: timestamp of the creation of the row,\n
+                    ref_key (str | None) IF VERIFIED: reference key of the row if it has
+                }) | None): returns the rows in the same order of the given keys, None if the row was not found
+        """
+        
+        cls.on_call()
+        
+        keys = [cls._to_immu_key(key).encode() for key in keys_or_refs]
+        
+        if only_verified:
+            # Each verification reads and writes the trusted state of the client, so they can't run at the same time
+            objs_data = [verified_get_or_none(immu_client, key) for key in keys]
+        else:
+            entries = get_all_entries(immu_client, keys)
+            objs_data = [entries.get(key) for key in keys]
+        
+        snapshot = get_active_snapshot()
+        
+        if snapshot is not None:
+            tx_id = snapshot.get_tx_id(immu_client, cls.immu_confs['database'])
+            objs_data = [
+                get_obj_data_at_tx(immu_client, obj_data, tx_id, only_verified) 
+                for obj_data in objs_data
+            ]
+        
+        objs = {}
+        for key_or_ref, obj_data in zip(keys_or_refs, objs_data):
+            if not obj_data:
+                objs[key_or_ref] = None
+                continue
+            
+            obj_dict = {}
+            
+            if only_verified:
+                get_only_verified_obj(obj_dict, obj_data)
+                
+            get_obj_common_infos(obj_dict, obj_data, codec=cls.immu_codec)
+            obj_dict['key'] = cls._from_immu_key(obj_dict['key'])
+            objs[key_or_ref] = obj_dict
+        
+        return objs
+
+
     @classmethod
     def get_score(cls, *, collection: str, tx_id: int = None, 
                   key: str = '', score: float = None,
@@ -414,7 +1056,7 @@ class ImmudbKeyField(models.Model):
         cls.on_call()
         
         collection_data = immu_client.zScan(
-            zset=collection.encode(), seekKey=key.encode(), 
+            zset=collection.encode(), seekKey=(cls._to_immu_key(key) if key else '').encode(), 
             seekScore=score, seekAtTx=tx_id,
             inclusive=True, limit=size_limit,
             desc=reverse,
@@ -425,11 +1067,81 @@ class ImmudbKeyField(models.Model):
         objs_data = []
         for obj in collection_data.entries:
             obj_dict = make_objs_on_collection(obj)
+            obj_dict['key'] = cls._from_immu_key(obj_dict['key'])
             objs_data.append(obj_dict)
             
         return objs_data
 
 
+    @classmethod
+    def iter_score(cls, *, collection: str, 
+                   min_score: float = None, max_score: float = None,
+                   reverse: bool = True, chunk_size: int = 1_000,
+                   values: bool = True) -> Iterator[dict]:
+        """
+            Iterate over all rows of a collection using scores, reading the collection in chunks
+            
+            USE:
+                for obj in ExampleModel.iter_score(collection='leaderboard', min_score=10):\n
+                    ...\n
+                \n
+                Only one chunk is kept in memory, so any collection size can be iterated.\n
+                The values are read at the transaction of the first chunk (or of the active immu_snapshot),\n
+                keys that didn't exist yet at that transaction are skipped.
+                
+            ALERT:
+                The members and scores of the collection are not pinned, immudb only scans the current sorted set.\n
+                Members added after the transaction are given, always when values is False, and the scores are the current ones.
+            
+            Kwargs:
+                collection (str) NOT NULL: collection of the rows,\n
+                min_score (float): get only rows with a given minimum score, not limited if not given,\n
+                max_score (float): get only rows with a given maximum score, not limited if not given,\n
+                reverse (bool): reverse the order,\n
+                chunk_size (int): number of rows read from immudb at once, max 1000,\n
+                values (bool): resolve the values of the rows, if False only key and score are given
+                
+            Yields:
+                dict({
+                    key (str): key of the row,\n
+                    score (float): the score of a row inside the collection,\n
+                    value (str) IF VALUES: value of the row,\n
+                    tx_id (int) IF VALUES: transaction id of the row,\n
+                    revision (int) IF VALUES: revision of the transaction of the row
+                }): rows in score order
+        """
+        
+        cls.on_call()
+        
+        snapshot = get_active_snapshot()
+        
+        if snapshot is not None:
+            tx_id = snapshot.get_tx_id(immu_client, cls.immu_confs['database'])
+        else:
+            tx_id = immu_client.currentState().txId
+        
+        seek_entry = None
+        
+        while True:
+            entries = zscan_entries(
+                immu_client, collection.encode(), 
+                seek_entry, tx_id, reverse, chunk_size,
+                min_score, max_score
+            )
+            
+            for obj_dict in make_objs_on_collection_at_tx(immu_client, entries, tx_id, values):
+                obj_dict['key'] = cls._from_immu_key(obj_dict['key'])
+                yield obj_dict
+            
+            if len(entries) < chunk_size:
+                return
+            
+            seek_entry = entries[-1]
+            
+            # The generator can be paused, so the client may be using another database
+            cls.on_call()
+
+
     @classmethod
     def get_tx(cls, *, tx_id: int) -> list[str]:
         """
@@ -448,18 +1160,19 @@ class ImmudbKeyField(models.Model):
 
 
     @classmethod
-    def get_with_tx(cls, *, key: str, tx_id: int) -> dict:
+    def get_with_tx(cls, *, key: str, tx_id: int, raw: bool = False) -> dict:
         """
             Get a only verified row using a key and transtion id
             
             Kwargs:
                 key (str) NOT NULL: index key of the row,\n
-                tx_id (int) NOT NULL: transaction id of the row
+                tx_id (int) NOT NULL: transaction id of the row,\n
+                raw (bool): give the value as stored bytes, without decoding
             
             Returns:
                 dict({
                     key (str): key of the row,\n
-                    value (dict): value of the row,\n
+                    value (dict | bytes): value of the row,\n
                     tx_id (int): transaction id of the row,\n
                     revision (int): revision of the transaction of the row,\n
                     verified (bool): True if the row is verified,\n
@@ -470,10 +1183,11 @@ class ImmudbKeyField(models.Model):
         
         cls.on_call()
         
-        obj_data = immu_client.verifiedGetAt(key.encode(), tx_id)
+        obj_data = immu_client.verifiedGetAt(cls._to_immu_key(key).encode(), tx_id)
         
         if obj_data:
-            obj_dict = make_obj_with_tx(obj_data)
+            obj_dict = make_obj_with_tx(obj_data, raw, cls.immu_codec)
+            obj_dict['key'] = cls._from_immu_key(obj_dict['key'])
             return obj_dict
 
 
@@ -501,13 +1215,81 @@ class ImmudbKeyField(models.Model):
         cls.on_call()
         
         history_data = immu_client.history(
-            key.encode(), 
+            cls._to_immu_key(key).encode(), 
             offset, 
             size_limit, 
             reverse
         )
         
-        return make_objs_history_for_a_key(history_data)
+        objs = make_objs_history_for_a_key(history_data)
+        
+        for obj in objs:
+            obj['key'] = cls._from_immu_key(obj['key'])
+        
+        return objs
+
+
+    @classmethod
+    def iter_history(cls, *, key: str, 
+                     chunk_size: int = 1_000, 
+                     since_tx: int = None, until_tx: int = None,
+                     reverse: bool = True) -> Iterator[HistoryEntry]:
+        """
+            Iterate over all history rows of a key, reading the history in chunks
+            
+            USE:
+                for entry in ExampleModel.iter_history(key='counter', since_tx=100):\n
+                    entry.tx_id, entry.value\n
+                \n
+                Only one chunk is kept in memory and the values are only decoded when 'value' is used,\n
+                so keys with long histories can be iterated.
+            
+            Kwargs:
+                key (str) NOT NULL: index key of the row,\n
+                chunk_size (int): number of rows read from immudb at once, max 1000,\n
+                since_tx (int): get only rows with transaction id greater than or equal,\n
+                until_tx (int): get only rows with transaction id less than or equal,\n
+                reverse (bool): reverse the order
+                
+            Yields:
+                HistoryEntry(
+                    key (str): key of the row,\n
+                    value (dict): value of the row, decoded when used,\n
+                    raw_value (bytes): value of the row without decoding,\n
+                    tx_id (int): transaction id of the row,\n
+                    revision (int): revision of the row
+                ): history rows of the key
+        """
+        
+        cls.on_call()
+        
+        offset = 0
+        
+        while True:
+            entries = history_entries(immu_client, cls._to_immu_key(key).encode(), offset, chunk_size, reverse)
+            
+            for entry in entries:
+                # The history is ordered by transaction, a row past the last bound ends the iteration
+                if (not reverse and until_tx is not None and entry.tx > until_tx) \
+                    or (reverse and since_tx is not None and entry.tx < since_tx):
+                    return
+                
+                if (until_tx is not None and entry.tx > until_tx) \
+                    or (since_tx is not None and entry.tx < since_tx):
+                    continue
+                
+                history_entry = HistoryEntry(entry, cls.immu_codec)
+                history_entry.key = cls._from_immu_key(history_entry.key)
+                
+                yield history_entry
+            
+            if len(entries) < chunk_size:
+                return
+            
+            offset += chunk_size
+            
+            # The generator can be paused, so the client may be using another database
+            cls.on_call()
 
     
     @classmethod
@@ -530,12 +1312,13 @@ class ImmudbKeyField(models.Model):
         cls.on_call()
         
         # Objects
-        scan = immu_client.scan(
-            key.encode(), prefix.encode(), 
+        scan = cls._scan(
+            (cls._to_immu_key(key) if key else '').encode(), 
+            cls._to_immu_key(prefix).encode(), 
             reverse, size_limit
         )
         
-        return {key.decode(): value.decode() for key, value in scan.items()}
+        return {cls._from_immu_key(key.decode()): value.decode() for key, value in scan.items()}
 
 
 def immu_sql_class(cls):
@@ -545,29 +1328,62 @@ def immu_sql_class(cls):
         
         USE:
             Put this decorator on every model that hierarchys 'ImmudbSQL'.
+            
+        MIGRATIONS:
+            The decorator only verify if the table schema of the model is migrated, using a fingerprint of the schema.\n
+            Use 'manage.py immu_makemigrations' and 'manage.py immu_migrate' to create and alter the table.\n
+            Set IMMU_AUTO_MIGRATE = True inside the settings.py to create and alter the table when the model is loaded.
     """
     
     # COPYING IMMUCONFS FROM BASE CLASS
     cls.immu_confs = cls.immu_confs.copy()
     
+    # GETTING CHANGES ONE THE IMMU CONFS
+    for key, value in IMMU_CONFS_BASE_KEY_VALUE.items():
+        if key not in cls.immu_confs:
+            cls.immu_confs[key] = value    
+    
+    # CREATING DATABASE IF DOES NOT EXISTS
+    database = cls.immu_confs['database']
+    
+    if database not in databases:
+        immu_client.createDatabase(database)
+        databases.append(database)
+        
+    immu_client.useDatabase(database)
+    
     # MAKING TABLE NAME FOR SQL
     table_name = f'{apps.get_containing_app_config(cls.__module__).label}_{lowercase_and_add_space(cls.__name__)}'
     
-    # CREATE TABLE
+    # SKIP CREATE AND ALTER IF THE TABLE SCHEMA DIDN'T CHANGE
     table_creator = TableCreator(cls, immu_client, table_name)
-    db_fields = table_creator.create_table()
+    fingerprint = make_schema_fingerprint(table_creator.make_db_fields(), table_creator.indexes)
     
-    # ALTER TABLE
-    table_alter = TableAlter(immu_client, table_name, db_fields, cls.__name__)
-    table_alter.alter()
-        
-    # GETTING CHANGES ONE THE IMMU CONFS
-    for key, value in IMMU_CONFS_BASE_KEY_VALUE.items():
-        if key not in cls.immu_confs:
-            cls.immu_confs[key] = value    
+    cls.immu_confs['fingerprint'] = fingerprint
+    cls.immu_confs['migrated'] = get_schema_fingerprint(immu_client, database, table_name) == fingerprint
+    
+    if not cls.immu_confs['migrated'] and AUTO_MIGRATE:
+        # CREATE TABLE
+        db_fields = table_creator.create_table()
+        
+        # ALTER TABLE
+        table_alter = TableAlter(immu_client, table_name, db_fields, cls.__name__, table_creator.indexes)
+        table_alter.alter()
+        
+        set_schema_fingerprint(immu_client, database, table_name, fingerprint)
+        cls.immu_confs['migrated'] = True
+    elif not cls.immu_confs['migrated']:
+        print(f'WARNING: table {table_name} of model {cls.__name__} is not migrated, run manage.py immu_makemigrations and manage.py immu_migrate')
     
     # PUTING TABLE NAME INSIDE IMMUCONFS
     cls.immu_confs['table_name'] = table_name
+    
+    # MAKING THE LOCAL REPLICA MODEL
+    if cls.immu_confs.get('replica', False):
+        cls.replica_model = make_replica_model(cls, table_name)
+        cls.replica = cls.replica_model.objects
+    
+    immu_sql_models.append(cls)
         
     return cls
 
@@ -589,7 +1405,8 @@ class ImmudbSQL(models.Model):
             models.JsonField,\n
             models.BigAutoField,\n
             models.CharField,\n
-            ImmuForeignKey
+            ImmuForeignKey,\n
+            ImmuJSONField
             
         ALERT:
             Don't overwrite Meta class.\n
@@ -609,6 +1426,18 @@ class ImmudbSQL(models.Model):
             Don't try to rename primary keys fields.\n
             Json fields inst allowed to be renamed.\n
             Foreign key fields inst allowed to be renamed.
+            
+        INDEXES:
+            Put 'db_index=True' or 'unique=True' inside a field to create an index for it.\n
+            Meta 'indexes' and 'unique_together' of the model are created as indexes too, the model Meta class must hierarchy 'ImmudbSQL.Meta'.\n
+            New indexes are created inside tables that already exists, unique indexes only inside empty tables.\n
+            Json fields can't be indexed.
+            
+        REPLICA:
+            Put 'replica': True inside the immu_confs to keep a read only copy of the table inside the django database.\n
+            Run 'manage.py makemigrations' and 'manage.py migrate' to create the replica table and 'manage.py immu_replicate' to copy the rows.\n
+            Use 'Model.replica' like a django manager, for fast queries with joins and aggregations: Model.replica.filter(name__startswith='J').count().\n
+            Immudb is still the verified source of the rows, the replica is only as recent as the last sync.
     """
     
     # ABC VARS
@@ -617,7 +1446,16 @@ class ImmudbSQL(models.Model):
         Configs for immu abstract class
         
         Kwargs:
-            database (str): name of the database to ultilized for the class
+            database (str): name of the database to ultilized for the class,\n
+            replica (bool): keep a local read only replica of the table
+    """
+    replica_model = None
+    """
+        Django model of the local replica of the table
+    """
+    replica = None
+    """
+        Manager of the local replica of the table
     """
     
     # CONFIG METHODS     
@@ -639,6 +1477,18 @@ class ImmudbSQL(models.Model):
                 None
         """
         
+        # The table can be migrated by immu_migrate after the model was loaded
+        if not cls.immu_confs['migrated']:
+            cls.immu_confs['migrated'] = reload_schema_fingerprint(
+                immu_client, cls.immu_confs['database'], cls.immu_confs['table_name']
+            ) == cls.immu_confs['fingerprint']
+        
+        if not cls.immu_confs['migrated']:
+            raise TableAlterError(
+                f'{cls.__name__} ERROR: table {cls.immu_confs["table_name"]} is not migrated, ' \
+                'run manage.py immu_makemigrations and manage.py immu_migrate'
+            )
+        
         immu_client.useDatabase(cls.immu_confs['database'])
         
         
@@ -661,21 +1511,26 @@ class ImmudbSQL(models.Model):
         
         cls.on_call()
         
-        insert_maker = InsertMaker(cls, cls.immu_confs['database'], cls.immu_confs['table_name'], immu_client)
+        atomic = get_active_atomic()
+        
+        insert_maker = InsertMaker(
+            cls, cls.immu_confs['database'], cls.immu_confs['table_name'], immu_client, 
+            atomic.next_number() if atomic is not None else 0,
+            atomic.next_increment(cls.immu_confs['database'], cls.immu_confs['table_name']) if atomic is not None else 0
+        )
         
         inserts = insert_maker.make(**kwargs)
-
-        immu_client.sqlExec(f"""
-            BEGIN TRANSACTION;
-                {inserts['insert_string']}
-            COMMIT;
-        """, inserts['values'])
         
+        if atomic is not None:
+            atomic.add_sql(cls.immu_confs['database'], inserts['insert_string'], inserts['values'], inserts.get('jsons'))
+            return inserts['sql_model']
+
+        # The jsons are saved first, so the row never points to a missing json
         if 'jsons' in inserts:
-            immu_client.useDatabase('jsonsqlfields')
-            immu_client.setAll(inserts['jsons'])
+            save_jsons(immu_client, inserts['jsons'])
+            cls.on_call()
 
-        cls.on_call()
+        sql_exec_in_transaction(immu_client, cls.immu_confs['database'], inserts['insert_string'], inserts['values'])
 
         return inserts['sql_model']
     
@@ -705,41 +1560,165 @@ class ImmudbSQL(models.Model):
             'sql_models': []
         }
         
+        atomic = get_active_atomic()
+        first_number = atomic.next_number(len(kwargs_list)) if atomic is not None else 0
+        first_increment = atomic.next_increment(
+            cls.immu_confs['database'], cls.immu_confs['table_name'], len(kwargs_list)
+        ) if atomic is not None else 0
+        
         for i in range(len(kwargs_list)):
-            insert_maker = InsertMaker(cls, cls.immu_confs['database'], cls.immu_confs['table_name'], immu_client, i)
+            insert_maker = InsertMaker(
+                cls, cls.immu_confs['database'], cls.immu_confs['table_name'], immu_client, 
+                first_number + i, first_increment + i
+            )
             inserts = insert_maker.make(**kwargs_list[i])
             
             inserts_list['insert_string'].append(inserts['insert_string'])
             inserts_list['values'].update(inserts['values'])
-            inserts_list['jsons'].update(inserts['jsons'])
+            inserts_list['jsons'].update(inserts.get('jsons', {}))
             inserts_list['sql_models'].append(inserts['sql_model'])
             
         insert_string = ' '.join(inserts_list['insert_string'])
-        immu_client.sqlExec(f"""
-            BEGIN TRANSACTION;
-                {insert_string}
-            COMMIT;
-        """, inserts_list['values'])
         
+        if atomic is not None:
+            atomic.add_sql(cls.immu_confs['database'], insert_string, inserts_list['values'], inserts_list['jsons'])
+            return inserts_list['sql_models']
+        
+        # The jsons are saved first, so the rows never point to a missing json
         if len(inserts_list['jsons']) > 0:
-            immu_client.useDatabase('jsonsqlfields')
-            immu_client.setAll(inserts_list['jsons'])
+            save_jsons(immu_client, inserts_list['jsons'])
+            cls.on_call()
+        
+        sql_exec_in_transaction(immu_client, cls.immu_confs['database'], insert_string, inserts_list['values'])
+        
+        return inserts_list['sql_models']
+        
+    
+    @classmethod
+    def bulk_update(
+        cls, rows: list[SQLModel], 
+        fields: list[str] = None, 
+        batch_size: int = 500) -> int:
+        """
+            Update multiple rows of this class sql table with one transaction per batch.
+        
+            Args:
+                rows (list[SQLModel]) NOT NULL: rows of this class sql table to update,\n
+                fields (list[str]): fields to update in every row, if not given only the fields that changed in each row are updated,\n
+                batch_size (int): max number of rows inside each transaction
+                
+            Returns:
+                int: number of rows that were updated
+        """
+        
+        cls.on_call()
+        
+        for row in rows:
+            if row._table_name != cls.immu_confs['table_name']:
+                raise ValueError(f'Row of table {row._table_name} cant be updated by {cls.__name__}')
+        
+        if fields is not None and len(rows) > 0:
+            columns_fields_names = rows[0]._get_columns_fields_names()
+            not_columns = [field for field in fields if field not in columns_fields_names]
+            
+            if len(not_columns) > 0:
+                raise ValueError(f'{not_columns} are not fields of the table {cls.immu_confs["table_name"]}')
+        
+        updated_rows = []
+        batches = []
+        jsons = {}
+        atomic = get_active_atomic()
+        
+        for i in range(0, len(rows), batch_size):
+            saves_list = {
+                'save_string': [],
+                'values': {}
+            }
+            
+            for number, row in enumerate(rows[i:i + batch_size]):
+                if atomic is not None:
+                    number = atomic.next_number()
+                
+                save = row._make_save(number, fields)
+                
+                if save is None:
+                    continue
+                
+                saves_list['save_string'].append(save['save_string'])
+                saves_list['values'].update(save['values'])
+                jsons.update(save['jsons'])
+                updated_rows.append(row)
+            
+            if len(saves_list['save_string']) > 0:
+                batches.append((' '.join(saves_list['save_string']), saves_list['values']))
+        
+        if atomic is not None:
+            for save_string, values in batches:
+                atomic.add_sql(cls.immu_confs['database'], save_string, values)
+            
+            atomic.jsons.update(jsons)
+        else:
+            # The jsons are saved first, so the rows never point to a missing json
+            if len(jsons) > 0:
+                save_jsons(immu_client, jsons)
+                cls.on_call()
+            
+            for save_string, values in batches:
+                sql_exec_in_transaction(immu_client, cls.immu_confs['database'], save_string, values)
 
         cls.on_call()
         
-        return inserts_list['sql_models']
+        for row in updated_rows:
+            row._immu_snapshot = row._make_snapshot()
+        
+        return len(updated_rows)
+        
+    
+    @classmethod
+    def migrate_json_to_inline(cls, field: str, batch_size: int = 500) -> int:
+        """
+            Move the jsons of a field stored inside the 'jsonsqlfields' database to the inline column of the row.
+            
+            USE:
+                Change the field to 'ImmuJSONField(inline=True)', run manage.py immu_makemigrations and manage.py immu_migrate so the inline column is added and call this method.\n
+                Only the rows with an empty inline column are moved, rows saved after the change keep their inline json.
+        
+            Args:
+                field (str) NOT NULL: name of the json field,\n
+                batch_size (int): max number of rows moved inside each transaction
+                
+            Returns:
+                int: number of rows that were moved
+        """
+        
+        cls.on_call()
+        
+        migrator = InlineJsonMigrator(
+            immu_client, 
+            cls.immu_confs['database'], 
+            cls.immu_confs['table_name'], 
+            field
+        )
+        
+        return migrator.migrate(batch_size)
         
     
     # GETTER
     @classmethod
     def get(
         cls, *, order_by: str = None,
-        **kwargs) -> SQLModel:
+        only: list[str] = None,
+        values: list[str] = None,
+        values_list: list[str] = None,
+        **kwargs) -> SQLModel | dict | tuple:
         """
             Search an object inside this class sql table.
         
             Kwargs:
                 order_by (string): order by an attribute, put '-'(negative value) in the beginning of the string for reverse order,\n
+                only (list[str]): retrieve only these fields (primary keys are always included) as SQLModel,\n
+                values (list[str]): retrieve only these fields as dict instead of SQLModel,\n
+                values_list (list[str]): retrieve only these fields as tuple (in the given order) instead of SQLModel,\n
                 kwargs (kwargs) NOT NULL: kwargs for making a search and get an SQLModel object, you can use search parameters to make searches more accurate:
                     ALERT: [
                         Can't search for jsons
@@ -763,7 +1742,7 @@ class ImmudbSQL(models.Model):
                 ]
                 
             Returns:
-                SQLModel: Return an object that was retrived by the search
+                SQLModel | dict | tuple: Return an object that was retrived by the search
         """
         
         cls.on_call()
@@ -774,29 +1753,37 @@ class ImmudbSQL(models.Model):
             immu_client
         )
         
-        values = getter.get(
+        objs = getter.get(
             size_limit=1,
-            order_by=order_by, **kwargs
+            order_by=order_by,
+            only=only, values=values, 
+            values_list=values_list, **kwargs
         )
         
-        return values
+        return objs
         
     
     @classmethod
     def all(
         cls, *,
         limit: int = None, offset: int = None, 
-        order_by: str = None) -> list[SQLModel]:
+        order_by: str = None,
+        only: list[str] = None,
+        values: list[str] = None,
+        values_list: list[str] = None) -> list[SQLModel | dict | tuple]:
         """
             Get all objects inside the table
         
             Kwargs:
                 order_by (string): order by an attribute, put '-'(negative value) in the beginning of the string for reverse order,\n
                 limit (int): limit size of the retriven objecs list,\n
-                offset (int): start search from index
+                offset (int): start search from index,\n
+                only (list[str]): retrieve only these fields (primary keys are always included) as SQLModel,\n
+                values (list[str]): retrieve only these fields as dict instead of SQLModel,\n
+                values_list (list[str]): retrieve only these fields as tuple (in the given order) instead of SQLModel
                 
             Returns:
-                list[SQLModel]: Return all objects inside the table
+                list[SQLModel | dict | tuple]: Return all objects inside the table
         """
         
         cls.on_call()
@@ -807,12 +1794,14 @@ class ImmudbSQL(models.Model):
             immu_client
         )
         
-        values = getter.get(
+        objs = getter.get(
             order_by=order_by,
-            limit=limit, offset=offset
+            limit=limit, offset=offset,
+            only=only, values=values, 
+            values_list=values_list
         )
 
-        return values
+        return objs
     
     
     @classmethod
@@ -820,7 +1809,11 @@ class ImmudbSQL(models.Model):
         cls, *,
         time_travel: dict = None,
         limit: int = None, offset: int = None,
-        order_by: str = None, **kwargs) -> list[SQLModel]:
+        order_by: str = None, 
+        only: list[str] = None,
+        values: list[str] = None,
+        values_list: list[str] = None,
+        **kwargs) -> list[SQLModel | dict | tuple]:
         """
             Get all objects inside the table that match given parameters
         
@@ -828,6 +1821,9 @@ class ImmudbSQL(models.Model):
                 order_by (string): order by an attribute, put '-'(negative value) in the beginning of the string for reverse order,\n
                 limit (int): limit size of the retriven objecs list,\n
                 offset (int): start search from index,\n
+                only (list[str]): retrieve only these fields (primary keys are always included) as SQLModel,\n
+                values (list[str]): retrieve only these fields as dict instead of SQLModel,\n
+                values_list (list[str]): retrieve only these fields as tuple (in the given order) instead of SQLModel,\n
                 time_travel ({
                     'since': tx_id (int) or date (string with format YYYY-MM-DD HH:MM) OR 'until': tx_id (int) or date (string with format YYYY-MM-DD HH:MM),
                     'before': tx_id (int) or date (string with format YYYY-MM-DD HH:MM) OR 'after': tx_id (int) or date (string with format YYYY-MM-DD HH:MM)
@@ -855,7 +1851,7 @@ class ImmudbSQL(models.Model):
                 ]
                 
             Returns:
-                list[SQLModel]: Return all objects inside the table
+                list[SQLModel | dict | tuple]: Return all objects inside the table
         """
         
         cls.on_call()
@@ -866,11 +1862,13 @@ class ImmudbSQL(models.Model):
             immu_client
         )
         
-        values = getter.get(
+        objs = getter.get(
             order_by=order_by, 
             limit=limit, offset=offset,
-            time_travel=time_travel, **kwargs
+            time_travel=time_travel, 
+            only=only, values=values, 
+            values_list=values_list, **kwargs
         )
 
-        return values
+        return objs
     
\ No newline at end of file
@@ -0,0 +1,126 @@
+from contextvars import ContextVar
+
+from immu_django.sql.jsons import save_jsons
+
+
+class ImmuAtomic:
+    def __init__(self, database: str = None) -> None:
+        """
+            INFO:
+                Writes of key/value and sql models queued to be commited together.
+            
+            USE:
+                Use 'immu_atomic' context to create it, the writes inside the context are commited when it ends,\n
+                the sql statements of a database inside one sql transaction and the key/value writes of a database inside one execAll.
+            
+            Args:
+                database (str): only database that can be written inside the context
+        """
+        
+        self.database = database
+        self.sql = {}
+        self.key_values = {}
+        self.verified_keys = {}
+        self.jsons = {}
+        self.numbers = 0
+        self.increments = {}
+        self.tx_ids = {}
+    
+    def _check_database(self, database: str):
+        if self.database is not None and database != self.database:
+            raise ValueError(f"Database {database} can't be written inside the immu_atomic of {self.database}")
+    
+    def next_number(self, count: int = 1) -> int:
+        """
+            First of the numbers reserved for the given count of queued sql statements,\n
+            the number is the suffix of the params of the statement, so the params of the queued statements don't collide
+        """
+        
+        number = self.numbers
+        self.numbers += count
+        
+        return number
+    
+    def next_increment(self, database: str, table_name: str, count: int = 1) -> int:
+        """
+            First of the auto increment offsets reserved for the given count of queued rows of the table,\n
+            the rows of a table queued before aren't inside the table yet, so they are counted by table
+        """
+        
+        key = (database, table_name)
+        increment = self.increments.get(key, 0)
+        self.increments[key] = increment + count
+        
+        return increment
+    
+    def add_sql(self, database: str, statement: str, values: dict, jsons: dict[bytes, bytes] = None):
+        self._check_database(database)
+        
+        sql = self.sql.setdefault(database, {'statements': [], 'values': {}})
+        sql['statements'].append(statement)
+        sql['values'].update(values)
+        
+        if jsons is not None:
+            self.jsons.update(jsons)
+    
+    def add_key_values(self, database: str, ops: list, verified_keys: list[bytes] = None):
+        self._check_database(database)
+        
+        self.key_values.setdefault(database, []).extend(ops)
+        
+        if verified_keys is not None:
+            self.verified_keys.setdefault(database, []).extend(verified_keys)
+    
+    def commit(self, immu_client) -> dict[str, list[int]]:
+        """
+            Commit the queued writes, one sql transaction and one key/value transaction per database.
+            
+            Returns:
+                dict[str, list[int]]: transaction ids of each database
+        """
+        
+        tx_ids = {}
+        
+        # The jsons are saved first, so the rows never point to a missing json
+        if len(self.jsons) > 0:
+            save_jsons(immu_client, self.jsons)
+        
+        for database, sql in self.sql.items():
+            immu_client.useDatabase(database)
+            
+            statements = ' '.join(sql['statements'])
+            result = immu_client.sqlExec(f"""
+                BEGIN TRANSACTION;
+                    {statements}
+                COMMIT;
+            """, sql['values'])
+            
+            tx_ids.setdefault(database, []).extend(tx.header.id for tx in result.txs)
+        
+        for database, ops in self.key_values.items():
+            immu_client.useDatabase(database)
+            
+            tx_ids.setdefault(database, []).append(immu_client.execAll(ops).id)
+            
+            for key in self.verified_keys.get(database, []):
+                immu_client.verifiedGet(key)
+        
+        return tx_ids
+
+
+_ACTIVE_ATOMIC = ContextVar('immu_atomic', default=None)
+"""
+Queue of the active 'immu_atomic' context
+"""
+
+
+def get_active_atomic() -> ImmuAtomic | None:
+    return _ACTIVE_ATOMIC.get()
+
+
+def set_active_atomic(atomic: ImmuAtomic | None):
+    return _ACTIVE_ATOMIC.set(atomic)
+
+
+def reset_active_atomic(token):
+    _ACTIVE_ATOMIC.reset(token)
@@ -0,0 +1,44 @@
+import json
+import os
+
+from immu_django.changes.constants import CHECKPOINTS_DIR
+
+
+class Checkpoint:
+    def __init__(self, name: str, directory: str = CHECKPOINTS_DIR) -> None:
+        """
+            INFO:
+                Last transaction id delivered to a consumer of the change feed, for each database.
+                
+            USE:
+                Set the checkpoint only after the consumer handled the batch, so a stopped consumer resumes from the last handled transaction.
+        
+            Args:
+                name (str): name of the consumer, each consumer has its own file,\n
+                directory (str): folder of the checkpoint files
+        """
+        
+        self.path = os.path.join(directory, f'{name}.json')
+        self.tx_ids = self._load()
+    
+    def _load(self) -> dict[str, int]:
+        if not os.path.exists(self.path):
+            return {}
+        
+        with open(self.path) as f:
+            return json.load(f)
+    
+    def get(self, database: str) -> int:
+        return self.tx_ids.get(database, 0)
+    
+    def set(self, database: str, tx_id: int):
+        self.tx_ids[database] = tx_id
+        
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        
+        # Write and rename so a crash never leaves a half written checkpoint
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.tx_ids, f)
+            
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,11 @@
+import os
+
+from django.conf import settings
+
+CHECKPOINTS_DIR = getattr(
+    settings, 'IMMU_CHECKPOINTS_DIR', 
+    os.path.join(getattr(settings, 'BASE_DIR', '.'), 'immu_checkpoints')
+)
+CHANGES_BATCH_SIZE = getattr(settings, 'IMMU_CHANGES_BATCH_SIZE', 100)
+CHANGES_POLL_INTERVAL = getattr(settings, 'IMMU_CHANGES_POLL_INTERVAL', 1.0)
+CHANGES_SQL_PAGE_SIZE = 1_000
@@ -0,0 +1,236 @@
+import json
+import time
+from typing import Iterator
+
+from immudb.datatypesv2 import EntriesSpec, EntryTypeAction, EntryTypeSpec
+
+from immu_django.abc_models import immu_client, immu_key_value_models, immu_sql_models
+from immu_django.changes.constants import CHANGES_BATCH_SIZE, CHANGES_POLL_INTERVAL, CHANGES_SQL_PAGE_SIZE
+from immu_django.exceptions import TableAlterError
+from immu_django.key_value.constants import IMMU_CONFS_BASE_KEY_VALUE
+from immu_django.sql.getters import GetWhere
+
+
+# Key/value entries are resolved by the server, sql entries only tell that a table changed
+_ENTRIES_SPEC = EntriesSpec(
+    kvEntriesSpec=EntryTypeSpec(action=EntryTypeAction.RESOLVE),
+    zEntriesSpec=EntryTypeSpec(action=EntryTypeAction.EXCLUDE),
+    sqlEntriesSpec=EntryTypeSpec(action=EntryTypeAction.ONLY_DIGEST)
+)
+
+# Keys of the sql entries are the sql prefix, 'R.' for rows or 'E.' and 'N.' for indexes, the database id and the table id
+_SQL_ROW_PREFIXES = (b'\x02R.', b'\x02E.', b'\x02N.')
+_SQL_TABLE_ID = slice(7, 11)
+
+_NOT_MIGRATED_MODELS = set()
+"""
+Sql models without migrated table already warned by the feed
+"""
+
+
+def _decode_value(value: bytes, model=None):
+    try:
+        if model is not None:
+            return model.immu_codec.decode(value)
+        
+        return json.loads(value.decode())
+    except ValueError:
+        return value
+
+
+def _get_key_value_model(database: str, key: str):
+    models = [
+        model for model in immu_key_value_models 
+        if model.immu_confs['database'] == database
+    ]
+    
+    for model in models:
+        namespace = model.immu_confs.get('namespace')
+        
+        if namespace and key.startswith(namespace):
+            return model
+    
+    models = [model for model in models if not model.immu_confs.get('namespace')]
+    
+    # Models of the same database without namespace share the keys, so the model is only known if it's alone
+    return models[0] if len(models) == 1 else None
+
+
+def _make_key_value_change(database: str, tx_id: int, entry) -> dict:
+    deleted = bool(entry.metadata and entry.metadata.deleted)
+    key = entry.key.decode()
+    model = _get_key_value_model(database, key)
+    
+    return {
+        'type': 'key_value',
+        'model': model,
+        'database': database,
+        'tx_id': tx_id,
+        'key': model._from_immu_key(key) if model is not None else key,
+        'value': None if deleted else _decode_value(entry.value, model),
+        'revision': entry.revision,
+        'deleted': deleted
+    }
+
+
+def _get_changed_tables(database: str, txs: list) -> set[str] | None:
+    """
+        Tables with rows written inside the transactions, None if they can't be known from the keys
+    """
+    
+    table_ids = set()
+    
+    for tx in txs:
+        for entry in tx.entries or []:
+            # Schema changes and unknown keys are read from every table
+            if not entry.key.startswith(_SQL_ROW_PREFIXES) or len(entry.key) < _SQL_TABLE_ID.stop:
+                return None
+            
+            table_ids.add(int.from_bytes(entry.key[_SQL_TABLE_ID], 'big'))
+    
+    immu_client.useDatabase(database)
+    
+    # The table ids follow the creation order of the tables
+    tables = [table[0] for table in immu_client.sqlQuery('SELECT * FROM TABLES();')]
+    
+    if any(table_id < 1 or table_id > len(tables) for table_id in table_ids):
+        return None
+    
+    return {tables[table_id - 1] for table_id in table_ids}
+
+
+def _get_sql_changes(database: str, first_tx: int, last_tx: int, tables: set[str] = None) -> list[dict]:
+    changes = []
+    
+    for model in immu_sql_models:
+        if model.immu_confs['database'] != database:
+            continue
+        
+        if tables is not None and model.immu_confs['table_name'] not in tables:
+            continue
+        
+        # A model without migrated table doesn't stop the changes of the other models
+        try:
+            model.on_call()
+        except TableAlterError as e:
+            if model not in _NOT_MIGRATED_MODELS:
+                _NOT_MIGRATED_MODELS.add(model)
+                print(f'WARNING: sql changes of {model.__name__} are skipped, {e}')
+            
+            continue
+        
+        getter = GetWhere(database, model.immu_confs['table_name'], immu_client)
+        offset = 0
+        
+        while True:
+            # Tables without changes inside the transactions give an empty page
+            rows = getter.get_page(
+                time_travel={'since': first_tx, 'until': last_tx},
+                limit=CHANGES_SQL_PAGE_SIZE, offset=offset
+            )
+            
+            for row in rows:
+                changes.append({
+                    'type': 'sql',
+                    'model': model,
+                    'database': database,
+                    'tx_id': last_tx,
+                    'row': row
+                })
+            
+            if len(rows) < CHANGES_SQL_PAGE_SIZE:
+                break
+            
+            offset += CHANGES_SQL_PAGE_SIZE
+    
+    immu_client.useDatabase(database)
+    
+    return changes
+
+
+def _scan_txs(database: str, tx_id: int, batch_size: int) -> list:
+    immu_client.useDatabase(database)
+    
+    if immu_client.currentState().txId <= tx_id:
+        return []
+    
+    return immu_client.txScan(tx_id + 1, batch_size, False, _ENTRIES_SPEC).txs or []
+
+
+def changes_since(
+    tx_id: int = 0, *, 
+    database: str = IMMU_CONFS_BASE_KEY_VALUE['database'],
+    batch_size: int = CHANGES_BATCH_SIZE,
+    follow: bool = False,
+    poll_interval: float = CHANGES_POLL_INTERVAL) -> Iterator[dict]:
+    """
+        INFO:
+            Generator of the changes of a database made after the given transaction id.
+            
+        USE:
+            for batch in changes_since(checkpoint.get('defaultdb')):\n
+                index(batch['changes'])\n
+                checkpoint.set('defaultdb', batch['last_tx'])\n
+            \n
+            The next batch is only read from immudb when the consumer asks for it,\n
+            so a slow consumer never has more than one batch in memory.
+            
+        ALERT:
+            Sql changes are the rows as they are at the end of the batch, with the last transaction of the batch as tx_id,\n
+            deleted sql rows are not sent.
+    
+        Args:
+            tx_id (int): last transaction id already handled, the changes start at the next transaction,\n
+            database (str): database to read the changes,\n
+            batch_size (int): max number of transactions of each batch,\n
+            follow (bool): wait for new transactions instead of stopping when there are no more changes,\n
+            poll_interval (float): seconds between the checks for new transactions when following
+            
+        Yields:
+            dict({
+                database (str): database of the changes,\n
+                first_tx (int): first transaction id of the batch,\n
+                last_tx (int): last transaction id of the batch,\n
+                changes (list[dict]): key/value changes with type, model, tx_id, key, value, revision and deleted,\n
+                    sql changes with type, model, tx_id and row (SQLModel)
+            }): batches of changes in transaction order
+    """
+    
+    while True:
+        txs = _scan_txs(database, tx_id, batch_size)
+        
+        if len(txs) == 0:
+            if not follow:
+                return
+            
+            time.sleep(poll_interval)
+            continue
+        
+        changes = []
+        sql_txs = []
+        
+        for tx in txs:
+            for entry in tx.kvEntries or []:
+                # References are resolved to the entry they point to, the entry has its own change
+                if entry.referencedBy:
+                    continue
+                
+                changes.append(_make_key_value_change(database, tx.header.id, entry))
+            
+            if tx.entries:
+                sql_txs.append(tx)
+        
+        first_tx = txs[0].header.id
+        last_tx = txs[-1].header.id
+        
+        if len(sql_txs) > 0:
+            changes.extend(_get_sql_changes(database, first_tx, last_tx, _get_changed_tables(database, sql_txs)))
+        
+        yield {
+            'database': database,
+            'first_tx': first_tx,
+            'last_tx': last_tx,
+            'changes': changes
+        }
+        
+        tx_id = last_tx
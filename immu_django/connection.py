@@ -1,15 +1,103 @@
 from django.conf import settings
+import grpc
+from immudb import generic_client_interceptor, grpcutils
 from immudb.client import ImmudbClient, PersistentRootService
 
 from .exceptions import LoginError, LogoutError
 
+
+_COMPRESSIONS = {
+    'gzip': grpc.Compression.Gzip,
+    'deflate': grpc.Compression.Deflate
+}
+
+
+def _make_channel_options() -> list[tuple]:
+    options = {
+        'grpc.keepalive_time_ms': getattr(settings, 'IMMU_GRPC_KEEPALIVE_TIME_MS', None),
+        'grpc.keepalive_timeout_ms': getattr(settings, 'IMMU_GRPC_KEEPALIVE_TIMEOUT_MS', None),
+        'grpc.max_send_message_length': getattr(settings, 'IMMU_GRPC_MAX_SEND_MESSAGE_LENGTH', None),
+        'grpc.max_receive_message_length': getattr(settings, 'IMMU_GRPC_MAX_RECEIVE_MESSAGE_LENGTH', None)
+    }
+    
+    # Pings on idle connections, so the load balancers don't drop them
+    if getattr(settings, 'IMMU_GRPC_KEEPALIVE_WITHOUT_CALLS', False):
+        options['grpc.keepalive_permit_without_calls'] = 1
+        options['grpc.http2.max_pings_without_data'] = 0
+    
+    options.update(getattr(settings, 'IMMU_GRPC_OPTIONS', {}))
+    
+    return [(name, value) for name, value in options.items() if value is not None]
+
+
+def _make_timeout_interceptor(timeout: float, timeouts: dict[str, float]):
+    def intercept_call(client_call_details, request_iterator, request_streaming, response_streaming):
+        call_timeout = client_call_details.timeout
+        
+        if call_timeout is None:
+            # '/immudb.schema.ImmuService/ExecAll' is 'ExecAll'
+            call_timeout = timeouts.get(client_call_details.method.rsplit('/', 1)[-1], timeout)
+        
+        client_call_details = grpcutils._ClientCallDetails(
+            client_call_details.method, call_timeout, 
+            client_call_details.metadata, client_call_details.credentials
+        )
+        
+        return client_call_details, request_iterator, None
+    
+    return generic_client_interceptor.create(intercept_call)
+
+
+def _get_compression():
+    compression = getattr(settings, 'IMMU_GRPC_COMPRESSION', None)
+    
+    if compression is None:
+        return None
+    
+    if compression not in _COMPRESSIONS:
+        raise ValueError(f"IMMU_GRPC_COMPRESSION must be one of {list(_COMPRESSIONS)} or None, not {compression!r}")
+    
+    return _COMPRESSIONS[compression]
+
+
+def _make_channel(url: str):
+    channel = grpc.insecure_channel(
+        url, options=_make_channel_options(), 
+        compression=_get_compression()
+    )
+    
+    timeout = getattr(settings, 'IMMU_GRPC_TIMEOUT', None)
+    timeouts = getattr(settings, 'IMMU_GRPC_TIMEOUTS', {})
+    
+    if timeout is not None or len(timeouts) > 0:
+        channel = grpc.intercept_channel(channel, _make_timeout_interceptor(timeout, timeouts))
+    
+    return channel
+
+
+def make_client() -> ImmudbClient:
+    url = getattr(settings, 'IMMU_URL', 'localhost:3322')
+    
+    client = ImmudbClient(
+        url, 
+        publicKeyFile=getattr(settings, 'IMMU_PUBLIC_KEY', None),
+        rs=PersistentRootService()
+    )
+    
+    # The client only takes the max receive size, so its channel is made again with all the options
+    client.channel.close()
+    client.channel = _make_channel(url)
+    client._resetStub()
+    
+    return client
+
+
 def starting_db() -> ImmudbClient:
+    # Wrong settings are raised as they are, not as a login error
+    _get_compression()
+    
     try:
-        client = ImmudbClient(
-            getattr(settings, 'IMMU_URL', 'localhost:3322'), 
-            publicKeyFile=getattr(settings, 'IMMU_PUBLIC_KEY', None),
-            rs=PersistentRootService()
-        )
+        client = make_client()
         
         client.login(
             getattr(settings, 'IMMU_USER', 'immudb'), 
@@ -6,3 +6,12 @@ class LoginError(Exception):
 
 class TableAlterError(Exception):
     pass
+
+class ReplicaReadOnlyError(Exception):
+    pass
+
+class BatchWriteError(Exception):
+    def __init__(self, message: str, written: dict, failed: list[dict]):
+        super().__init__(message)
+        self.written = written
+        self.failed = failed
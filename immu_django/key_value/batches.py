@@ -0,0 +1,205 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from immudb.datatypes import KeyValue, ReferenceRequest, ZAddRequest
+
+from immu_django.exceptions import BatchWriteError
+from immu_django.key_value.constants import BATCH_MAX_BYTES, BATCH_MAX_ENTRIES, BATCH_PARALLEL, MAX_WORKERS
+
+
+ENTRY_OVERHEAD_BYTES = 16
+"""
+Bytes of the protobuf framing of each key/value inside a setAll request
+"""
+
+
+def make_chunks(
+    objs: dict[bytes, bytes], 
+    max_bytes: int = BATCH_MAX_BYTES, 
+    max_entries: int = BATCH_MAX_ENTRIES) -> list[dict[bytes, bytes]]:
+    chunks = []
+    chunk = {}
+    chunk_bytes = 0
+    
+    for key, value in objs.items():
+        size = len(key) + len(value) + ENTRY_OVERHEAD_BYTES
+        
+        if len(chunk) > 0 and (len(chunk) >= max_entries or chunk_bytes + size > max_bytes):
+            chunks.append(chunk)
+            chunk = {}
+            chunk_bytes = 0
+            
+        chunk[key] = value
+        chunk_bytes += size
+    
+    if len(chunk) > 0:
+        chunks.append(chunk)
+    
+    return chunks
+
+
+def _get_op_size(op: KeyValue | ReferenceRequest | ZAddRequest) -> int:
+    if isinstance(op, KeyValue):
+        return len(op.key) + len(op.value) + ENTRY_OVERHEAD_BYTES
+    
+    if isinstance(op, ReferenceRequest):
+        return len(op.key) + len(op.referencedKey) + ENTRY_OVERHEAD_BYTES
+    
+    return len(op.set) + len(op.key) + ENTRY_OVERHEAD_BYTES
+
+
+def make_ops_chunks(
+    ops_groups: list[list], 
+    max_bytes: int = BATCH_MAX_BYTES, 
+    max_entries: int = BATCH_MAX_ENTRIES) -> list[list]:
+    chunks = []
+    chunk = []
+    chunk_bytes = 0
+    
+    # The operations of a group are never split, so they stay inside the same transaction
+    for ops in ops_groups:
+        size = sum(_get_op_size(op) for op in ops)
+        
+        if len(chunk) > 0 and (len(chunk) + len(ops) > max_entries or chunk_bytes + size > max_bytes):
+            chunks.append(chunk)
+            chunk = []
+            chunk_bytes = 0
+            
+        chunk.extend(ops)
+        chunk_bytes += size
+    
+    if len(chunk) > 0:
+        chunks.append(chunk)
+    
+    return chunks
+
+
+def _send_chunk(send, chunk) -> tuple[int | None, Exception | None]:
+    try:
+        return send(chunk).id, None
+    except Exception as e:
+        return None, e
+
+
+def _get_chunk_keys(chunk: dict | list) -> list[bytes]:
+    if isinstance(chunk, dict):
+        return list(chunk.keys())
+    
+    return [op.key for op in chunk if isinstance(op, KeyValue)]
+
+
+def _write_chunks(send, chunks: list, parallel: bool) -> dict:
+    if parallel and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            results = list(executor.map(lambda chunk: _send_chunk(send, chunk), chunks))
+    else:
+        results = []
+        
+        for chunk in chunks:
+            results.append(_send_chunk(send, chunk))
+            
+            if results[-1][1] is not None:
+                break
+    
+    tx_ids = sorted(tx_id for tx_id, error in results if error is None)
+    
+    written = {
+        'tx_ids': tx_ids,
+        'first_tx': tx_ids[0] if len(tx_ids) > 0 else None,
+        'last_tx': tx_ids[-1] if len(tx_ids) > 0 else None,
+        'chunks': len(chunks)
+    }
+    
+    failed = [
+        {'keys': _get_chunk_keys(chunk), 'error': error}
+        for chunk, (_, error) in zip(chunks, results) 
+        if error is not None
+    ]
+    
+    # Chunks after the first failure of the sequential writing
+    failed += [
+        {'keys': _get_chunk_keys(chunk), 'error': None}
+        for chunk in chunks[len(results):]
+    ]
+    
+    if len(failed) > 0:
+        raise BatchWriteError(
+            f'{len(failed)} of {len(chunks)} chunks were not written, {len(tx_ids)} were written until tx {written["last_tx"]}',
+            written, failed
+        )
+    
+    return written
+
+
+def set_all_in_chunks(
+    immu_client, objs: dict[bytes, bytes], *,
+    max_bytes: int = BATCH_MAX_BYTES, 
+    max_entries: int = BATCH_MAX_ENTRIES,
+    parallel: bool = BATCH_PARALLEL) -> dict:
+    """
+        INFO:
+            Set all key/values using one transaction per chunk, the chunks are limited by size and number of entries,\n
+            so big batches don't fail on the grpc max message size or on the immudb max entries per transaction.
+            
+        USE:
+            The client must be using the database of the key/values.\n
+            With parallel the chunks are sent at the same time over the client channel, else they are sent in order and the first failure stops the writing.
+        
+        ALERT:
+            Each chunk is its own transaction, a failure doesn't undo the chunks that were written.
+            
+        Args:
+            immu_client (ImmudbClient): client of immudb,\n
+            objs (dict[bytes, bytes]): key/values to set,\n
+            max_bytes (int): max size of the keys and values of a chunk,\n
+            max_entries (int): max number of key/values of a chunk,\n
+            parallel (bool): send the chunks at the same time
+            
+        Returns:
+            dict({
+                tx_ids (list[int]): transaction ids of the chunks,\n
+                first_tx (int | None): first transaction id,\n
+                last_tx (int | None): last transaction id,\n
+                chunks (int): number of chunks
+            }): transactions of the written chunks
+            
+        Raises:
+            BatchWriteError: some chunks were not written, 'written' has the transactions of the written chunks\n
+                and 'failed' the keys and the error (None if the chunk was not sent) of the others
+    """
+    
+    return _write_chunks(
+        immu_client.setAll, 
+        make_chunks(objs, max_bytes, max_entries), 
+        parallel
+    )
+
+
+def exec_all_in_chunks(
+    immu_client, ops_groups: list[list], *,
+    max_bytes: int = BATCH_MAX_BYTES, 
+    max_entries: int = BATCH_MAX_ENTRIES,
+    parallel: bool = BATCH_PARALLEL) -> dict:
+    """
+        INFO:
+            Like 'set_all_in_chunks' for execAll operations (KeyValue, ReferenceRequest, ZAddRequest),\n
+            the operations of each group are always sent inside the same transaction.
+            
+        Args:
+            immu_client (ImmudbClient): client of immudb,\n
+            ops_groups (list[list]): groups of operations, like a row and its index entries,\n
+            max_bytes (int): max size of the operations of a chunk,\n
+            max_entries (int): max number of operations of a chunk,\n
+            parallel (bool): send the chunks at the same time
+            
+        Returns:
+            dict: transactions of the written chunks, like 'set_all_in_chunks'
+            
+        Raises:
+            BatchWriteError: some chunks were not written, like 'set_all_in_chunks'
+    """
+    
+    return _write_chunks(
+        immu_client.execAll, 
+        make_ops_chunks(ops_groups, max_bytes, max_entries), 
+        parallel
+    )
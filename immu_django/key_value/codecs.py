@@ -0,0 +1,176 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+import json
+import uuid
+
+from immu_django.key_value.constants import NOT_FIELDS_VALUES
+
+
+# Values that json keeps with their types, legacy rows have them as str
+_JSON_TYPES = {
+    'AutoField': int,
+    'BigAutoField': int,
+    'SmallAutoField': int,
+    'IntegerField': int,
+    'BigIntegerField': int,
+    'SmallIntegerField': int,
+    'PositiveIntegerField': int,
+    'PositiveBigIntegerField': int,
+    'PositiveSmallIntegerField': int,
+    'FloatField': float,
+    'BooleanField': lambda value: value == 'True'
+}
+
+# Values that json can't keep, stored as str and parsed on decoding
+_STR_TYPES = {
+    'DecimalField': Decimal,
+    'DateTimeField': datetime.fromisoformat,
+    'DateField': date.fromisoformat,
+    'TimeField': time.fromisoformat,
+    'UUIDField': uuid.UUID
+}
+
+
+def _encode_str(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    
+    return str(value)
+
+
+def _make_json_decoder(parse):
+    def decode(value):
+        # Legacy rows were saved with str() of every field
+        if isinstance(value, str):
+            return None if value == 'None' else parse(value)
+        
+        return value
+    
+    return decode
+
+
+def _make_str_decoder(parse):
+    def decode(value):
+        if value is None or value == 'None':
+            return None
+        
+        return parse(value)
+    
+    return decode
+
+
+class ValueCodec:
+    def __init__(self, fields: list) -> None:
+        """
+            INFO:
+                Encoder and decoder of the values of a key/value model, compiled once from the fields of the model.
+            
+            USE:
+                Values are stored as compact json with the types of the fields, numbers and booleans are kept as json types,\n
+                decimals, dates and uuids are stored as str and given back as python values.\n
+                Rows saved with str() of every field are still decoded to the types of the fields.
+            
+            Args:
+                fields (list[Field]): fields of the model
+        """
+        
+        self.fields = [field for field in fields if field.name not in NOT_FIELDS_VALUES]
+        # Kwargs accepted by the model for a row of create_mult, the key and create_multi are given by the model
+        self._names = {name for field in fields for name in (field.name, field.attname)} - {'key', 'create_multi'}
+        self._encoders = []
+        self._decoders = []
+        
+        for field in self.fields:
+            internal_type = field.get_internal_type()
+            
+            if internal_type in _STR_TYPES:
+                self._encoders.append((field.name, field.to_python, _encode_str))
+                self._decoders.append((field.name, _make_str_decoder(_STR_TYPES[internal_type])))
+            elif internal_type in _JSON_TYPES:
+                self._encoders.append((field.name, field.to_python, None))
+                self._decoders.append((field.name, _make_json_decoder(_JSON_TYPES[internal_type])))
+            else:
+                self._encoders.append((field.name, None, None))
+    
+    def get_values(self, obj) -> dict:
+        """
+            Python values of the fields of a model instance
+        """
+        
+        return self.to_python({field.name: getattr(obj, field.name) for field in self.fields})
+    
+    def to_python(self, values: dict) -> dict:
+        """
+            Values converted to the types of the fields
+        """
+        
+        values = dict(values)
+        
+        for name, to_python, _ in self._encoders:
+            if to_python is not None and values.get(name) is not None:
+                values[name] = to_python(values[name])
+        
+        return values
+    
+    def validate_many(self, objs: dict[str, dict]) -> dict[str, dict]:
+        """
+            INFO:
+                Values of many rows converted to the types of the fields, without making a model instance per row.
+            
+            USE:
+                Raises TypeError for values that are not fields of the model, like the model init,\n
+                and ValidationError for values that can't be converted to the type of the field.
+            
+            Args:
+                objs (dict[str, dict]): values of the rows by key
+            
+            Returns:
+                dict[str, dict]: converted values of the rows by key
+        """
+        
+        objs = {key: dict(values) for key, values in objs.items()}
+        
+        for values in objs.values():
+            unknown = values.keys() - self._names
+            
+            if len(unknown) > 0:
+                raise TypeError(f'Unexpected fields {sorted(unknown)} for the model')
+        
+        # One field for the whole batch at a time
+        for name, to_python, _ in self._encoders:
+            if to_python is None:
+                continue
+            
+            for values in objs.values():
+                value = values.get(name)
+                
+                if value is not None:
+                    values[name] = to_python(value)
+        
+        return objs
+    
+    def encode(self, values: dict) -> bytes:
+        """
+            Stored bytes of python values
+        """
+        
+        values = dict(values)
+        
+        for name, _, encode in self._encoders:
+            if encode is not None and values.get(name) is not None:
+                values[name] = encode(values[name])
+        
+        return json.dumps(values, separators=(',', ':'), default=str).encode()
+    
+    def decode(self, value: bytes) -> dict:
+        """
+            Python values of stored bytes
+        """
+        
+        values = json.loads(value)
+        
+        for name, decode in self._decoders:
+            if name in values:
+                values[name] = decode(values[name])
+        
+        return values
@@ -5,3 +5,9 @@ IMMU_CONFS_BASE_KEY_VALUE = {
     'expireableDateTime': getattr(settings, 'IMMU_DEFAULT_EXPIRE_TIME', None),
     'database': getattr(settings, 'IMMU_DEFAULT_DB', 'defaultdb'),
 }
+MAX_WORKERS = getattr(settings, 'IMMU_MAX_WORKERS', 8)
+BATCH_MAX_BYTES = getattr(settings, 'IMMU_BATCH_MAX_BYTES', 3 * 1024 * 1024)
+BATCH_MAX_ENTRIES = getattr(settings, 'IMMU_BATCH_MAX_ENTRIES', 1_024)
+BATCH_PARALLEL = getattr(settings, 'IMMU_BATCH_PARALLEL', False)
+KEY_GENERATOR = getattr(settings, 'IMMU_KEY_GENERATOR', 'ulid')
+KEY_NAMESPACES = getattr(settings, 'IMMU_KEY_NAMESPACES', False)
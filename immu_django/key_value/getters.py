@@ -1,4 +1,7 @@
 import json
+import grpc
+
+from immudb.grpc import schema_pb2
 
 
 # GET METHOD
@@ -8,19 +11,103 @@ def get_only_verified_obj(obj_dict: dict, obj_data):
     obj_dict['ref_key'] = getattr(obj_data, 'refkey', None)
     
     
-def get_obj_common_infos(obj_dict: dict, obj_data):
+def decode_value(value: bytes, raw: bool = False, codec=None):
+    if raw:
+        return value
+    
+    if codec is not None:
+        return codec.decode(value)
+    
+    return json.loads(value.decode())
+    
+    
+def get_obj_common_infos(obj_dict: dict, obj_data, raw: bool = False, codec=None):
     obj_dict['key'] = obj_data.key.decode()
-    obj_dict['value'] = json.loads(obj_data.value.decode())
-    obj_dict['tx_id'] = obj_data.tx
+    obj_dict['value'] = decode_value(obj_data.value, raw, codec)
+    obj_dict['tx_id'] = obj_data.tx if hasattr(obj_data, 'tx') else obj_data.id
     obj_dict['revision'] = obj_data.revision
     
     
+# GET MANY METHOD
+def get_all_entries(immu_client, keys: list[bytes]) -> dict[bytes, object]:
+    entries = immu_client.stub.GetAll(schema_pb2.KeyListRequest(keys=keys)).entries
+    
+    objs = {}
+    for entry in entries:
+        key = entry.referencedBy.key if entry.HasField('referencedBy') else entry.key
+        objs[key] = entry
+    
+    return objs
+
+
+def verified_get_or_none(immu_client, key: bytes):
+    try:
+        return immu_client.verifiedGet(key)
+    except grpc.RpcError as e:
+        if 'key not found' in str(e.details()):
+            return None
+        raise e
+    
+    
+# SNAPSHOT
+def get_history_item_at_tx(immu_client, key: bytes, tx_id: int):
+    offset = 0
+    
+    while True:
+        history_data = immu_client.history(key, offset, 1_000, True)
+        
+        for data in history_data:
+            if data.tx <= tx_id:
+                return data
+        
+        if len(history_data) < 1_000:
+            return None
+        
+        offset += 1_000
+
+
+def get_obj_data_at_tx(immu_client, obj_data, tx_id: int, verified: bool = False):
+    if obj_data is None:
+        return None
+    
+    obj_tx = obj_data.tx if hasattr(obj_data, 'tx') else obj_data.id
+    
+    if obj_tx <= tx_id:
+        return obj_data
+    
+    history_data = get_history_item_at_tx(immu_client, obj_data.key, tx_id)
+    
+    if history_data is None:
+        return None
+    
+    if verified:
+        return immu_client.verifiedGetAt(obj_data.key, history_data.tx)
+    
+    return immu_client.stub.Get(schema_pb2.KeyRequest(key=obj_data.key, atTx=history_data.tx))
+
+
+def get_or_none(immu_client, key: bytes):
+    try:
+        return immu_client.stub.Get(schema_pb2.KeyRequest(key=key))
+    except grpc.RpcError as e:
+        if 'key not found' in str(e.details()):
+            return None
+        raise e
+
+
+def scan_entries(immu_client, key: bytes, prefix: bytes, reverse: bool, size_limit: int) -> list:
+    return immu_client.stub.Scan(schema_pb2.ScanRequest(
+        seekKey=key, prefix=prefix, 
+        desc=reverse, limit=size_limit
+    )).entries
+    
+    
 # GET WITH TX METHOD
-def make_obj_with_tx(obj_data) -> dict:
+def make_obj_with_tx(obj_data, raw: bool = False, codec=None) -> dict:
     return  {
         'tx_id': obj_data.id,
         'key': obj_data.key.decode(),
-        'value': json.loads(json.loads(obj_data.value.decode())),
+        'value': decode_value(obj_data.value, raw, codec),
         'verified': obj_data.verified,
         'timestamp': obj_data.timestamp,
         'ref_key': getattr(obj_data, 'refkey', None),
@@ -39,6 +126,94 @@ def make_objs_on_collection(obj) -> dict:
     } 
     
     
+# ITER SCORE METHOD
+def zscan_entries(
+    immu_client, collection: bytes, 
+    seek_entry, tx_id: int, 
+    reverse: bool, size_limit: int,
+    min_score: float = None, max_score: float = None) -> list:
+    # sinceTx only waits for the index to reach the transaction, the scan is always of the current sorted set
+    request = schema_pb2.ZScanRequest(
+        set=collection, limit=size_limit, desc=reverse, sinceTx=tx_id,
+        # Scores are only limited when given
+        minScore=schema_pb2.Score(score=min_score) if min_score is not None else None,
+        maxScore=schema_pb2.Score(score=max_score) if max_score is not None else None
+    )
+    
+    # Next page starts after the last entry of the previous one
+    if seek_entry is not None:
+        request.seekKey = seek_entry.key
+        request.seekScore = seek_entry.score
+        request.seekAtTx = seek_entry.atTx
+        request.inclusiveSeek = False
+    
+    return immu_client.stub.ZScan(request).entries
+
+
+def make_objs_on_collection_at_tx(immu_client, entries: list, tx_id: int, values: bool) -> list[dict]:
+    objs = []
+    
+    for obj in entries:
+        if not values:
+            objs.append({'key': obj.key.decode(), 'score': obj.score})
+            continue
+        
+        obj_data = get_obj_data_at_tx(immu_client, obj.entry, tx_id)
+        
+        # The key didn't exist at the transaction
+        if obj_data is None:
+            continue
+        
+        objs.append({
+            'key': obj.key.decode(),
+            'score': obj.score,
+            'tx_id': obj_data.tx,
+            'value': obj_data.value.decode(),
+            'revision': obj_data.revision
+        })
+    
+    return objs
+
+
+# ITER HISTORY METHOD
+class HistoryEntry:
+    __slots__ = ('key', 'tx_id', 'revision', 'raw_value', '_value', '_codec')
+    
+    def __init__(self, entry, codec=None) -> None:
+        """
+            INFO:
+                Revision of a key inside the history, the value is only decoded when it's used.
+        
+            Args:
+                entry (Entry): entry of the history,\n
+                codec (ValueCodec): codec of the model that decodes the value
+        """
+        
+        self.key = entry.key.decode()
+        self.tx_id = entry.tx
+        self.revision = entry.revision
+        self.raw_value = entry.value
+        self._value = None
+        self._codec = codec
+    
+    @property
+    def value(self):
+        if self._value is None:
+            self._value = decode_value(self.raw_value, codec=self._codec)
+            
+        return self._value
+    
+    def __repr__(self):
+        return f'HistoryEntry(key={self.key!r}, tx_id={self.tx_id}, revision={self.revision})'
+
+
+def history_entries(immu_client, key: bytes, offset: int, size_limit: int, reverse: bool) -> list:
+    return immu_client.stub.History(schema_pb2.HistoryRequest(
+        key=key, offset=offset, 
+        limit=size_limit, desc=reverse
+    )).entries
+
+
 # GET HISTORY METHOD
 def make_objs_history_for_a_key(history_data) -> list[dict]:
     objs = []
@@ -57,11 +232,11 @@ def make_objs_history_for_a_key(history_data) -> list[dict]:
 
 
 # AFTER METHOD
-def make_obj_after_other_obj(obj_data) -> dict:
+def make_obj_after_other_obj(obj_data, codec=None) -> dict:
     return {
         'tx_id': obj_data.id,
         'key': obj_data.key.decode(),
-        'value': json.loads(obj_data.value.decode()),
+        'value': decode_value(obj_data.value, codec=codec),
         'verified': obj_data.verified,
         'timestamp': obj_data.timestamp,
         'ref_key': getattr(obj_data, 'refkey', None),
@@ -0,0 +1,90 @@
+from datetime import date, datetime, time
+from typing import Iterator
+
+from immudb.datatypes import ReferenceRequest, ZAddRequest
+from immudb.grpc import schema_pb2
+
+
+INDEX_PREFIX = '@idx@'
+RANGE_INDEX_PREFIX = '@range@'
+INDEX_PAGE_SIZE = 1_000
+
+
+def make_index_prefix(namespace: str, field: str, value) -> bytes:
+    # Outside of the namespace, so the scans of the model don't read the index entries
+    return f'{INDEX_PREFIX}{namespace}{field}@{value}@'.encode()
+
+
+def is_index_entry(entry) -> bool:
+    return entry.HasField('referencedBy') and entry.referencedBy.key.startswith(INDEX_PREFIX.encode())
+
+
+def make_index_refs(namespace: str, indexes: list[str], key: bytes, values: dict) -> list[ReferenceRequest]:
+    """
+        Index entries of a row, references from '@idx@namespace field@value@key' to the key of the row
+    """
+    
+    return [
+        ReferenceRequest(
+            key=make_index_prefix(namespace, field, values.get(field)) + key, 
+            referencedKey=key
+        )
+        for field in indexes
+    ]
+
+
+def scan_index(immu_client, prefix: bytes) -> Iterator:
+    """
+        Entries of the rows referenced by the index entries with the given prefix, immudb resolves the references inside the scan
+    """
+    
+    seek_key = b''
+    
+    while True:
+        entries = immu_client.stub.Scan(schema_pb2.ScanRequest(
+            seekKey=seek_key, prefix=prefix, limit=INDEX_PAGE_SIZE
+        )).entries
+        
+        yield from entries
+        
+        if len(entries) < INDEX_PAGE_SIZE:
+            return
+        
+        seek_key = entries[-1].referencedBy.key
+
+
+# RANGE INDEXES
+def make_score(value) -> float | None:
+    """
+        Score of a numeric or date value inside a range index, dates are timestamps
+    """
+    
+    if value is None or value == 'None':
+        return None
+    
+    if isinstance(value, datetime):
+        return value.timestamp()
+    
+    if isinstance(value, date):
+        return datetime.combine(value, time()).timestamp()
+    
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return make_score(datetime.fromisoformat(str(value)))
+
+
+def make_range_zadds(range_prefix: str, range_indexes: list[str], key: bytes, values: dict) -> list[ZAddRequest]:
+    """
+        Range index entries of a row, the key of the row inside a sorted set per field with the value as score
+    """
+    
+    zadds = []
+    
+    for field in range_indexes:
+        score = make_score(values.get(field))
+        
+        if score is not None:
+            zadds.append(ZAddRequest(set=f'{range_prefix}{field}'.encode(), score=score, key=key))
+    
+    return zadds
@@ -1,20 +1,13 @@
 from datetime import timedelta
 from django.utils.timezone import now
-import json
 from typing import Dict
 
-from immu_django.key_value.constants import NOT_FIELDS_VALUES
+from immudb.datatypes import KeyValue, ReferenceRequest, ZAddRequest
 
 
 # SAVING METHOD
 def auth_and_get_get_fields(self) -> Dict[str, dict]:
-    values = {}
-    
-    for field in self.__class__._meta.fields:
-        if field.name not in NOT_FIELDS_VALUES:
-            value = getattr(self, field.name)
-            values[field.name] = str(value)
-    return values
+    return self.immu_codec.get_values(self)
 
 
 def save_obj_in_database_to_unique(self, immu_client, key: bytes, json_values: bytes):
@@ -28,6 +21,21 @@ def save_obj_in_database_to_unique(self, immu_client, key: bytes, json_values: b
         immu_client.set(key, json_values)
 
 
+def save_obj_with_indexes(self, immu_client, key: bytes, json_values: bytes, index_refs: list):
+    """
+        Write the row and its index entries inside the same transaction.
+        
+        ALERT:
+            execAll has no verified version, so verified rows are not verified writes,\n
+            the row is only verified when it's read back with verifiedGet after the write.
+    """
+    
+    immu_client.execAll([KeyValue(key=key, value=json_values), *index_refs])
+    
+    if self.verified:
+        immu_client.verifiedGet(key)
+
+
 # SET ONE
 def set_refs_to_unique(immu_client, key: str, refs: list[str], verified: bool):
     if refs is not None:
@@ -49,6 +57,19 @@ def set_collections_to_unique(immu_client, key: str, collection_scores: Dict[str
                 immu_client.zAdd(ref.encode(), score, key.encode())
 
 
+# ATOMIC
+def make_refs_and_collections_ops(key: str, refs: list[str], collection_scores: Dict[str, float]) -> list:
+    ops = [
+        ReferenceRequest(key=ref.encode(), referencedKey=key.encode()) 
+        for ref in refs or []
+    ]
+    
+    for collection, score in (collection_scores or {}).items():
+        ops.append(ZAddRequest(set=collection.encode(), score=score, key=key.encode()))
+    
+    return ops
+
+
 # SET MULTI
 def get_all_objs_key_value_in_multiple(obj_list: list[dict[str, dict, list[str], dict[str, float]]]) -> Dict[str, dict]:
     objs = {}
@@ -57,8 +78,8 @@ def get_all_objs_key_value_in_multiple(obj_list: list[dict[str, dict, list[str],
     return objs
 
 
-def encode_all_objs_key_value_to_saving_in_multiple(objs: Dict[str, dict]) -> Dict[bytes, bytes]:
-    return {key.encode(): json.dumps(value).encode() for key, value in objs.items()}
+def encode_all_objs_key_value_to_saving_in_multiple(objs: Dict[str, dict], codec) -> Dict[bytes, bytes]:
+    return {key.encode(): codec.encode(value) for key, value in objs.items()}
 
 
 def set_verified_refs_and_collections_in_multiple(immu_client, obj: dict):
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+
+from immu_django.abc_models import immu_sql_models
+from immu_django.sql.migrations import MigrationPlanner
+
+
+class Command(BaseCommand):
+    help = 'Create the migration files of the immudb sql models, without changing the immudb tables.'
+    
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'app_label', nargs='*',
+            help='Apps to create the migrations, all apps if not given.'
+        )
+        parser.add_argument(
+            '--noinput', '--no-input', action='store_false', dest='interactive',
+            help="Don't ask if fields were renamed, every changed field is handled as a new field."
+        )
+    
+    
+    def _ask(self, txt: str) -> bool:
+        user_response = None
+        
+        while user_response is None:
+            user_res = input(txt)
+            if user_res.lower() == 'y' or user_res.lower() == 'yes':
+                user_response = True
+            elif user_res.lower() == 'n' or user_res.lower() == 'no':
+                user_response = False
+        
+        return user_response
+    
+    
+    def handle(self, *app_labels, interactive: bool = True, **options):
+        models_by_app = {}
+        
+        for model in immu_sql_models:
+            if len(app_labels) == 0 or model._meta.app_label in app_labels:
+                models_by_app.setdefault(model._meta.app_label, []).append(model)
+        
+        for app_label, models in models_by_app.items():
+            planner = MigrationPlanner(
+                app_label, models, 
+                questioner=self._ask if interactive else None
+            )
+            name = planner.write()
+            
+            if name is None:
+                self.stdout.write(f'No changes detected in app {app_label}')
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Migration {name} created for app {app_label} with {len(planner.operations)} operations'
+                ))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from immu_django.abc_models import immu_client, immu_sql_models
+from immu_django.sql.migrations import MigrationExecutor
+
+
+class Command(BaseCommand):
+    help = 'Apply the migration files of the immudb sql models inside immudb.'
+    
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'app_label', nargs='*',
+            help='Apps to apply the migrations, all apps if not given.'
+        )
+    
+    
+    def handle(self, *app_labels, **options):
+        models_by_app = {}
+        
+        for model in immu_sql_models:
+            if len(app_labels) == 0 or model._meta.app_label in app_labels:
+                models_by_app.setdefault(model._meta.app_label, []).append(model)
+        
+        for app_label, models in models_by_app.items():
+            executor = MigrationExecutor(immu_client, app_label, models)
+            applied = executor.migrate()
+            
+            if len(applied) == 0:
+                self.stdout.write(f'No migrations to apply in app {app_label}')
+            
+            for name in applied:
+                self.stdout.write(self.style.SUCCESS(f'Applied {app_label}.{name}'))
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from immu_django.abc_models import immu_sql_models
+from immu_django.changes.checkpoints import Checkpoint
+from immu_django.changes.constants import CHANGES_POLL_INTERVAL
+from immu_django.replicas.constants import REPLICA_CHECKPOINT_NAME
+from immu_django.replicas.sync import ReplicaSync
+
+
+class Command(BaseCommand):
+    help = 'Copy the rows of the immudb sql models that changed since the last sync to their local replicas.'
+    
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'app_label', nargs='*',
+            help='Apps to sync the replicas, all apps if not given.'
+        )
+        parser.add_argument(
+            '--follow', action='store_true',
+            help='Keep syncing the replicas.'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=CHANGES_POLL_INTERVAL,
+            help='Seconds between the syncs when following.'
+        )
+    
+    
+    def handle(self, *app_labels, **options):
+        models = [
+            model for model in immu_sql_models 
+            if model.replica_model is not None
+            and (len(app_labels) == 0 or model._meta.app_label in app_labels)
+        ]
+        
+        if len(models) == 0:
+            self.stdout.write('No models with replica inside the immu_confs')
+            return
+        
+        # One checkpoint for every replica, so a sync doesn't write over the watermarks of the others
+        checkpoint = Checkpoint(REPLICA_CHECKPOINT_NAME)
+        syncs = [ReplicaSync(model, checkpoint) for model in models]
+        
+        while True:
+            for sync in syncs:
+                count = sync.sync()
+                
+                if count > 0 or not options['follow']:
+                    self.stdout.write(self.style.SUCCESS(
+                        f'Copied {count} rows of {sync.cls.__name__} to {sync.replica_model._meta.db_table}'
+                    ))
+            
+            if not options['follow']:
+                return
+            
+            time.sleep(options['poll_interval'])
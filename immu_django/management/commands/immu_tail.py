@@ -0,0 +1,76 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from immu_django.changes.checkpoints import Checkpoint
+from immu_django.changes.constants import CHANGES_BATCH_SIZE
+from immu_django.changes.feed import changes_since
+from immu_django.key_value.constants import IMMU_CONFS_BASE_KEY_VALUE
+
+
+class Command(BaseCommand):
+    help = 'Send the changes of an immudb database made after the last checkpoint to a handler.'
+    
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--name', default='default',
+            help='Name of the consumer, each consumer has its own checkpoint.'
+        )
+        parser.add_argument(
+            '--database', default=IMMU_CONFS_BASE_KEY_VALUE['database'],
+            help='Database to read the changes.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=CHANGES_BATCH_SIZE,
+            help='Max number of transactions of each batch.'
+        )
+        parser.add_argument(
+            '--from-tx', type=int, default=None,
+            help='Start after this transaction id instead of the checkpoint.'
+        )
+        parser.add_argument(
+            '--handler', default=None,
+            help='Dotted path of a callable that receives each batch, the changes are printed if not given.'
+        )
+        parser.add_argument(
+            '--follow', action='store_true',
+            help='Keep waiting for new transactions.'
+        )
+    
+    
+    def _print_batch(self, batch: dict):
+        for change in batch['changes']:
+            model = change['model']._meta.label if change['model'] is not None else None
+            
+            if change['type'] == 'sql':
+                data = change['row']._get_fields_values()
+            else:
+                data = {'key': change['key'], 'value': change['value'], 'deleted': change['deleted']}
+            
+            self.stdout.write(json.dumps(
+                {'tx_id': change['tx_id'], 'type': change['type'], 'model': model, **data}, 
+                default=str
+            ))
+    
+    
+    def handle(self, *args, **options):
+        database = options['database']
+        checkpoint = Checkpoint(options['name'])
+        handler = import_string(options['handler']) if options['handler'] else self._print_batch
+        
+        tx_id = options['from_tx'] if options['from_tx'] is not None else checkpoint.get(database)
+        
+        for batch in changes_since(
+            tx_id, database=database, 
+            batch_size=options['batch_size'], 
+            follow=options['follow']):
+            handler(batch)
+            
+            # Only handled batches move the checkpoint, a stopped consumer sends the batch again
+            checkpoint.set(database, batch['last_tx'])
+            
+            self.stderr.write(self.style.SUCCESS(
+                f"Handled {len(batch['changes'])} changes of {database} until tx {batch['last_tx']}"
+            ))
@@ -0,0 +1,5 @@
+from django.conf import settings
+
+REPLICA_DATABASE = getattr(settings, 'IMMU_REPLICA_DATABASE', 'default')
+REPLICA_PAGE_SIZE = getattr(settings, 'IMMU_REPLICA_PAGE_SIZE', 1_000)
+REPLICA_CHECKPOINT_NAME = 'immu_replicas'
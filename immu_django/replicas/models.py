@@ -0,0 +1,133 @@
+from django.db import models
+from django.db.models import AutoField, JSONField
+
+from immu_django.exceptions import ReplicaReadOnlyError
+from immu_django.replicas.constants import REPLICA_DATABASE
+from immu_django.utils import ImmuForeignKey, lowercase_and_add_space
+
+
+class ReplicaManager(models.Manager):
+    """
+        Manager of the read only replica of an 'ImmudbSQL' model, the queries use the replica database.
+    """
+    
+    def get_queryset(self):
+        return super().get_queryset().using(REPLICA_DATABASE)
+
+
+class ReplicaModel(models.Model):
+    """
+        INFO:
+            Abstract class of the local replicas of 'ImmudbSQL' models.
+            
+        ALERT:
+            The replica is read only, the rows are only written by 'manage.py immu_replicate'.
+    """
+    
+    objects = ReplicaManager()
+    
+    class Meta:
+        abstract = True
+    
+    def save(self, *args, **kwargs):
+        raise ReplicaReadOnlyError(f'{self.__class__.__name__} is a read only replica, save the row inside immudb')
+    
+    def delete(self, *args, **kwargs):
+        raise ReplicaReadOnlyError(f'{self.__class__.__name__} is a read only replica, delete the row inside immudb')
+
+
+def _clone_field(field, primary_key: bool, **kwargs):
+    # Immudb gives the values of the auto fields, the replica only copies them
+    if isinstance(field, AutoField):
+        return models.BigIntegerField(primary_key=primary_key, **kwargs)
+    
+    _, _, args, field_kwargs = field.deconstruct()
+    
+    # bulk_create runs pre_save, the dates must be the ones saved inside immudb
+    field_kwargs.pop('auto_now', None)
+    field_kwargs.pop('auto_now_add', None)
+    
+    field_kwargs.update(kwargs)
+    field_kwargs['primary_key'] = primary_key
+    
+    return field.__class__(*args, **field_kwargs)
+
+
+def _make_foreign_key_fields(field, attrs: dict, columns: dict, pks: list[str]):
+    field_model = field.target_field.model
+    
+    obj_name = f'{field_model._meta.app_label}_{lowercase_and_add_space(field_model._meta.object_name)}'
+    
+    for fg_pk in [fd for fd in field_model._meta.fields if fd.primary_key]:
+        name = f'{field.name}_{fg_pk.name}'
+        
+        attrs[name] = _clone_field(fg_pk, False, null=field.null, db_index=True)
+        columns[f'{field.name}__{fg_pk.name}__{obj_name}__fg'] = (name, 'value')
+        
+        if field.primary_key:
+            pks.append(name)
+
+
+def make_replica_model(cls, table_name: str) -> type[ReplicaModel]:
+    """
+        INFO:
+            Make the django model of the local replica of an 'ImmudbSQL' model.
+            
+        USE:
+            Every column of the immudb table is a field of the replica,\n
+            json fields are 'models.JSONField' and foreign keys are the primary keys of the foreign row (field_pk).
+            
+        Args:
+            cls (ImmudbSQL): model to replicate,\n
+            table_name (str): name of the immudb table of the model
+            
+        Returns:
+            ReplicaModel: model of the replica table, with the immudb columns of the fields inside 'immu_columns'
+    """
+    
+    fields = cls._meta.fields
+    
+    attrs = {'__module__': cls.__module__}
+    columns = {}
+    pks = []
+    
+    single_pk = len([field for field in fields if field.primary_key]) == 1 \
+        and not any(field.primary_key and isinstance(field, ImmuForeignKey) for field in fields)
+    
+    for field in fields:
+        if isinstance(field, ImmuForeignKey):
+            _make_foreign_key_fields(field, attrs, columns, pks)
+        elif isinstance(field, JSONField):
+            attrs[field.name] = models.JSONField(null=True)
+            
+            if getattr(field, 'inline', False):
+                columns[f'__inline_json__{field.attname}'] = (field.name, 'inline_json')
+            else:
+                columns[f'__json__{field.attname}'] = (field.name, 'json')
+        else:
+            attrs[field.name] = _clone_field(field, field.primary_key and single_pk)
+            columns[field.attname] = (field.name, 'value')
+            
+            if field.primary_key:
+                pks.append(field.name)
+    
+    # Tables without primary keys use the auto increment '_id' column of immudb
+    if len(pks) == 0:
+        attrs['immu_id'] = models.BigIntegerField(primary_key=True)
+        columns['_id'] = ('immu_id', 'value')
+        pks.append('immu_id')
+    
+    meta_attrs = {
+        'db_table': f'immu_replica_{table_name}',
+        'app_label': cls._meta.app_label
+    }
+    
+    # Django has no composite primary keys, so they are an unique together with an auto id
+    if not single_pk and 'immu_id' not in pks:
+        meta_attrs['unique_together'] = [tuple(pks)]
+    
+    attrs['Meta'] = type('Meta', (), meta_attrs)
+    attrs['immu_columns'] = columns
+    attrs['immu_pks'] = pks
+    
+    return type(f'{cls.__name__}Replica', (ReplicaModel,), attrs)
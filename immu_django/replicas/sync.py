@@ -0,0 +1,164 @@
+import json
+
+from django.db import transaction
+
+from immu_django.abc_models import immu_client
+from immu_django.changes.checkpoints import Checkpoint
+from immu_django.changes.constants import CHANGES_BATCH_SIZE
+from immu_django.changes.feed import _scan_txs
+from immu_django.replicas.constants import REPLICA_CHECKPOINT_NAME, REPLICA_DATABASE, REPLICA_PAGE_SIZE
+from immu_django.sql.getters import GetWhere
+
+
+class ReplicaSync:
+    def __init__(self, cls, checkpoint: Checkpoint = None, batch_size: int = CHANGES_BATCH_SIZE) -> None:
+        """
+            INFO:
+                Copy the rows of an 'ImmudbSQL' model that changed after the replica watermark to its local replica.
+                
+            USE:
+                The first sync copies the whole table, the next ones only the rows of the transactions after the watermark.\n
+                The rows are upserted, so a sync stopped before saving the watermark only copies the rows again.
+                
+            ALERT:
+                Rows deleted inside immudb are not deleted inside the replica.
+        
+            Args:
+                cls (ImmudbSQL): model with 'replica' inside the immu_confs,\n
+                checkpoint (Checkpoint): watermarks of the replicas, syncs of the same process must share it,\n
+                batch_size (int): max number of transactions read at once
+        """
+        
+        self.cls = cls
+        self.replica_model = cls.replica_model
+        self.database = cls.immu_confs['database']
+        self.table_name = cls.immu_confs['table_name']
+        self.batch_size = batch_size
+        
+        self.checkpoint = checkpoint if checkpoint is not None else Checkpoint(REPLICA_CHECKPOINT_NAME)
+        self.checkpoint_key = f'{self.database}.{self.table_name}'
+    
+    
+    def _get_jsons(self, keys: set[str]) -> dict[str, dict]:
+        if len(keys) == 0:
+            return {}
+        
+        immu_client.useDatabase('jsonsqlfields')
+        jsons = immu_client.getAll([key.encode() for key in keys])
+        immu_client.useDatabase(self.database)
+        
+        return {key.decode(): json.loads(value.decode()) for key, value in jsons.items()}
+    
+    
+    def _make_objs(self, columns: list[str], rows: list[tuple]) -> list:
+        immu_columns = self.replica_model.immu_columns
+        
+        # All the jsons of the page are read at once
+        jsons = self._get_jsons({
+            value for row in rows for column, value in zip(columns, row)
+            if value is not None 
+            and column in immu_columns 
+            and immu_columns[column][1] == 'json'
+        })
+        
+        objs = []
+        
+        for row in rows:
+            values = {}
+            
+            for column, value in zip(columns, row):
+                # Old columns of renamed fields
+                if column not in immu_columns:
+                    continue
+                
+                name, column_type = immu_columns[column]
+                
+                if value is None:
+                    values[name] = None
+                elif column_type == 'json':
+                    values[name] = jsons.get(value)
+                elif column_type == 'inline_json':
+                    values[name] = json.loads(value)
+                else:
+                    values[name] = value
+                    
+            objs.append(self.replica_model(**values))
+        
+        return objs
+    
+    
+    def _save(self, objs: list):
+        if len(objs) == 0:
+            return
+        
+        pks = self.replica_model.immu_pks
+        update_fields = [
+            name for name, _ in self.replica_model.immu_columns.values() 
+            if name not in pks
+        ]
+        
+        with transaction.atomic(using=REPLICA_DATABASE):
+            if len(update_fields) == 0:
+                self.replica_model.objects.bulk_create(objs, ignore_conflicts=True)
+            else:
+                self.replica_model.objects.bulk_create(
+                    objs, update_conflicts=True, 
+                    unique_fields=pks, update_fields=update_fields
+                )
+    
+    
+    def _copy_rows(self, time_travel: dict) -> int:
+        getter = GetWhere(self.database, self.table_name, immu_client)
+        columns = getter.table_fields_names
+        
+        offset = 0
+        count = 0
+        
+        while True:
+            rows = getter._make_query(
+                {}, time_travel, 
+                REPLICA_PAGE_SIZE, offset, None, columns
+            )
+            
+            self._save(self._make_objs(columns, rows))
+            count += len(rows)
+            
+            if len(rows) < REPLICA_PAGE_SIZE:
+                return count
+            
+            offset += REPLICA_PAGE_SIZE
+    
+    
+    def sync(self) -> int:
+        """
+            Copy the rows that changed after the watermark to the replica
+            
+            Returns:
+                int: number of copied rows
+        """
+        
+        self.cls.on_call()
+        
+        tx_id = self.checkpoint.get(self.checkpoint_key)
+        count = 0
+        
+        if tx_id == 0:
+            tx_id = immu_client.currentState().txId
+            count += self._copy_rows({'before': tx_id + 1})
+            
+            self.checkpoint.set(self.checkpoint_key, tx_id)
+        
+        while True:
+            txs = _scan_txs(self.database, tx_id, self.batch_size)
+            
+            if len(txs) == 0:
+                return count
+            
+            last_tx = txs[-1].header.id
+            
+            # Only transactions with sql entries can change the table
+            if any(tx.entries for tx in txs):
+                count += self._copy_rows({'since': txs[0].header.id, 'until': last_tx})
+                
+            self.checkpoint.set(self.checkpoint_key, last_tx)
+            tx_id = last_tx
@@ -0,0 +1,58 @@
+from contextvars import ContextVar
+
+
+class ImmuSnapshot:
+    def __init__(self, tx_ids: dict[str, int] = None) -> None:
+        """
+            INFO:
+                Snapshot of immudb databases pinned to a transaction id per database.
+                
+            USE:
+                Use 'immu_snapshot' context to create it, every read inside the context sees the databases as they were in the snapshot transaction.\n
+                The results of the reads are cached inside the snapshot, they can't change.
+        
+            Args:
+                tx_ids (dict[str, int]): transaction id of each database of the snapshot
+        """
+        
+        self.tx_ids = tx_ids if tx_ids is not None else {}
+        self.cache = {}
+    
+    def get_tx_id(self, immu_client, database: str) -> int:
+        """
+            Get the transaction id of the database, the client must be using the database.\n
+            Databases that are read for the first time inside the snapshot are pinned to their current transaction.
+        """
+        
+        if database not in self.tx_ids:
+            self.tx_ids[database] = immu_client.currentState().txId
+            
+        return self.tx_ids[database]
+    
+    def get_cached(self, key: tuple, make):
+        """
+            Get the cached result of a read, making it if it wasn't cached.
+        """
+        
+        if key not in self.cache:
+            self.cache[key] = make()
+        
+        return self.cache[key]
+
+
+_ACTIVE_SNAPSHOT = ContextVar('immu_snapshot', default=None)
+"""
+Snapshot of the active 'immu_snapshot' context
+"""
+
+
+def get_active_snapshot() -> ImmuSnapshot | None:
+    return _ACTIVE_SNAPSHOT.get()
+
+
+def set_active_snapshot(snapshot: ImmuSnapshot | None):
+    return _ACTIVE_SNAPSHOT.set(snapshot)
+
+
+def reset_active_snapshot(token):
+    _ACTIVE_SNAPSHOT.reset(token)
@@ -1,3 +1,5 @@
+import sys
+
 from immu_django.exceptions import TableAlterError
 
 
@@ -13,14 +15,46 @@ class _TableField:
         self.unique = table[8]
         
 
+def get_table_indexes(immu_client, table_name: str) -> list[tuple[tuple[str], bool]]:
+    indexes = immu_client.sqlQuery(
+        f"SELECT * FROM INDEXES('{table_name}');"
+    )
+    
+    table_indexes = []
+    
+    for index in indexes:
+        # The name of the index is 'table(column1,column2)'
+        name, unique = index[1], index[2]
+        columns = name[name.index('(') + 1:name.rindex(')')].split(',')
+        
+        table_indexes.append((tuple(column.strip() for column in columns), unique))
+    
+    return table_indexes
+
+
+def is_table_empty(immu_client, table_name: str) -> bool:
+    return len(immu_client.sqlQuery(f'SELECT * FROM {table_name} LIMIT 1;')) == 0
+
+
+def make_index_error(model_name: str, table_name: str, columns: tuple[str]) -> TableAlterError:
+    return TableAlterError(
+        f'{model_name} ERROR: index ({", ".join(columns)}) cant be created, table {table_name} already has rows. ' \
+        'NOTE: immudb only creates indexes on empty tables, remove the index from the model ' \
+        'or copy the rows to a new model that has the index'
+    )
+
+
 class TableAlter:
     def __init__(
         self, immu_client, 
         table_name: str, db_fields: list[str],
-        model_name: str):
+        model_name: str, indexes: list[tuple[tuple[str], bool]] = None):
         self.immu_client = immu_client
         self.table_name = table_name
         
+        self.indexes = indexes if indexes is not None else []
+        self.new_indexes = []
+        
         self.db_fields = [field for field in db_fields 
                             if not field.startswith('PRIMARY')
                             and not field.startswith('__json__')]
@@ -39,6 +73,7 @@ class TableAlter:
             f"SELECT * FROM COLUMNS('{table_name}');"
         )
         self.table_fields = self._get_tables_fields(tables)
+        self.table_indexes = get_table_indexes(immu_client, table_name)
         
         self.model_name = model_name
         
@@ -108,7 +143,28 @@ class TableAlter:
             self._remove_fields(field, field)
                
                 
+    def _keep_inline_json_old_fields(self):
+        db_names = [field.split(" ", 1)[0] for field in self.db_fields]
+        
+        for tb_field in self.table_fields:
+            tb_name = tb_field.split(" ", 1)[0]
+            
+            if not tb_name.startswith('__json__'):
+                continue
+            
+            inline_name = f'__inline_json__{tb_name.split("__json__", 1)[-1]}'
+            
+            if inline_name in db_names:
+                self.to_remove_tb.append(tb_field)
+    
+    
     def _get_user_valid_input(self, txt: str) -> str:
+        if sys.stdin is None or not sys.stdin.isatty():
+            raise TableAlterError(
+                f'{self.model_name} ERROR: table {self.table_name} changed and there is no terminal to confirm the changes, ' \
+                'run manage.py immu_makemigrations and manage.py immu_migrate'
+            )
+        
         user_response = None
         
         while user_response is None:
@@ -194,8 +250,37 @@ class TableAlter:
             self.immu_client.sqlExec(f'ALTER TABLE {self.table_name} ADD COLUMN {field}')
      
     
+    def _see_if_index_is_new(self, columns: tuple[str], unique: bool) -> bool:
+        old_names = {new: old for old, new in self.rename_fields.items()}
+        columns = tuple(old_names.get(column, column) for column in columns)
+        
+        # A unique index of the same columns also serves a not unique one
+        for index_columns, index_unique in self.table_indexes:
+            if index_columns == columns and (index_unique or not unique):
+                return False
+        
+        return True
+    
+    
+    def _append_indexes(self):
+        new_indexes = [
+            (columns, unique) for columns, unique in self.indexes 
+            if self._see_if_index_is_new(columns, unique)
+        ]
+        
+        if len(new_indexes) > 0 and not is_table_empty(self.immu_client, self.table_name):
+            raise make_index_error(self.model_name, self.table_name, new_indexes[0][0])
+        
+        for columns, unique in new_indexes:
+            unique_str = 'UNIQUE ' if unique else ''
+            self.immu_client.sqlExec(
+                f'CREATE {unique_str}INDEX IF NOT EXISTS ON {self.table_name}({", ".join(columns)})'
+            )
+            self.new_indexes.append(columns)
+    
+    
     def _send_succes_msg(self):
-        if len(self.rename_fields) > 0 or len(self.new_fields) > 0:
+        if len(self.rename_fields) > 0 or len(self.new_fields) > 0 or len(self.new_indexes) > 0:
             print(f'SUCCESS: {self.table_name} table alter')
     
     
@@ -223,6 +308,7 @@ class TableAlter:
     
     def alter(self):
         self._remove_same_fields()
+        self._keep_inline_json_old_fields()
         
         for db_field in self.db_fields:
             if db_field in self.to_remove_db:
@@ -247,6 +333,107 @@ class TableAlter:
         
         self._rename_fields()
         self._append_fields()
+        self._append_indexes()
         
         self._send_succes_msg()
-                
\ No newline at end of file
+                
+
+class InlineJsonMigrator:
+    def __init__(
+        self, immu_client, db: str,
+        table_name: str, field_name: str):
+        self.immu_client = immu_client
+        self.db = db
+        self.table_name = table_name
+        
+        self.json_field = f'__json__{field_name}'
+        self.inline_json_field = f'__inline_json__{field_name}'
+        
+        tables = immu_client.sqlQuery(
+            f"SELECT * FROM COLUMNS('{table_name}');"
+        )
+        table_fields = [_TableField(table) for table in tables]
+        
+        self.pks = [field.name for field in table_fields if field.primary_key]
+        table_fields_names = [field.name for field in table_fields]
+        
+        if self.json_field not in table_fields_names \
+            or self.inline_json_field not in table_fields_names:
+            raise TableAlterError(
+                f'{table_name} ERROR: {self.json_field} and {self.inline_json_field} ' \
+                'must exist inside the table to migrate the json field to inline'
+            )
+    
+    
+    def _get_rows(self, limit: int, offset: int) -> list[tuple]:
+        # Rows saved after the field was moved to inline already have the last json inside the inline column
+        return self.immu_client.sqlQuery(
+            f'SELECT {", ".join(self.pks)}, {self.json_field} FROM {self.table_name} ' \
+            f'WHERE {self.inline_json_field} IS NULL ' \
+            f'LIMIT {limit} OFFSET {offset};'
+        )
+    
+    
+    def _get_jsons(self, rows: list[tuple]) -> dict[bytes, bytes]:
+        keys = [row[-1].encode() for row in rows if row[-1] is not None]
+        
+        if len(keys) == 0:
+            return {}
+        
+        self.immu_client.useDatabase('jsonsqlfields')
+        jsons = self.immu_client.getAll(keys)
+        self.immu_client.useDatabase(self.db)
+        
+        return jsons
+    
+    
+    def _update_rows(self, rows: list[tuple], jsons: dict[bytes, bytes]) -> int:
+        updates = []
+        values = {}
+        
+        for number, row in enumerate(rows):
+            if row[-1] is None or row[-1].encode() not in jsons:
+                continue
+            
+            where_str = []
+            for pk, value in zip(self.pks, row):
+                values[f'{pk}{number}'] = value
+                where_str.append(f'{pk} = @{pk}{number}')
+                
+            values[f'{self.inline_json_field}{number}'] = jsons[row[-1].encode()]
+            updates.append(
+                f'UPDATE {self.table_name} SET {self.inline_json_field} = @{self.inline_json_field}{number} ' \
+                f'WHERE {" AND ".join(where_str)} AND {self.inline_json_field} IS NULL;'
+            )
+        
+        if len(updates) > 0:
+            self.immu_client.sqlExec(f"""
+                BEGIN TRANSACTION;
+                    {' '.join(updates)}
+                COMMIT;
+            """, values)
+        
+        return len(updates)
+    
+    
+    def migrate(self, batch_size: int = 500) -> int:
+        migrated = 0
+        offset = 0
+        
+        while True:
+            rows = self._get_rows(batch_size, offset)
+            
+            if len(rows) == 0:
+                break
+            
+            jsons = self._get_jsons(rows)
+            updated = self._update_rows(rows, jsons)
+            migrated += updated
+            
+            # Updated rows leave the query, only the rows without json are skipped
+            offset += len(rows) - updated
+        
+        if migrated > 0:
+            print(f'SUCCESS: {migrated} rows of {self.json_field} moved to {self.inline_json_field} in {self.table_name}')
+        
+        return migrated
@@ -1,6 +1,14 @@
+from django.conf import settings
+
 NOT_FIELDS = (
     'pks',
     'table_name',
     'immu_client',
-    'db'
-)
\ No newline at end of file
+    'db',
+    'immu_snapshot'
+)
+JSON_DEDUPLICATION = getattr(settings, 'IMMU_JSON_DEDUPLICATION', False)
+JSON_CACHE_SIZE = getattr(settings, 'IMMU_JSON_CACHE_SIZE', 1_000)
+AUTO_MIGRATE = getattr(settings, 'IMMU_AUTO_MIGRATE', False)
+SQL_SESSIONS_POOL_SIZE = getattr(settings, 'IMMU_SQL_SESSIONS_POOL_SIZE', 4)
+SQL_SESSIONS_KEEPALIVE = getattr(settings, 'IMMU_SQL_SESSIONS_KEEPALIVE', 60)
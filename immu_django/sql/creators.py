@@ -13,12 +13,11 @@ class TableCreator:
         self.immu_client = immu_client
         self.table_name = table_name
         self.cls = cls
-        self.all_tables = [
-            table[0] for table in 
-            immu_client.sqlQuery('SELECT * FROM TABLES();')
-        ]
+        self.all_tables = []
         
         self.json_fields = []
+        self.indexes = []
+        self.db_fields = None
     
     
     def _make_foreign_key_field(
@@ -81,11 +80,69 @@ class TableCreator:
             db_fields.append(name)    
 
 
+    def _get_index_columns(self, field_name: str) -> list[str]:
+        field = self.cls._meta.get_field(field_name)
+        
+        if isinstance(field, JSONField):
+            raise ValueError(f'Json field {field.name} inside model {self.cls.__name__} cant be indexed')
+        
+        if isinstance(field, ForeignKey):
+            db_fields = []
+            self._make_foreign_key_field(field, db_fields, [])
+            return [db_field.split(' ', 1)[0] for db_field in db_fields]
+        
+        return [field.attname]
+    
+    
+    def _append_index(self, field_names: list[str], unique: bool):
+        columns = []
+        
+        for field_name in field_names:
+            columns.extend(self._get_index_columns(field_name.lstrip('-')))
+        
+        index = (tuple(columns), unique)
+        
+        if index not in self.indexes:
+            self.indexes.append(index)
+    
+    
+    def _make_indexes(self):
+        for field in self.cls._meta.fields:
+            if field.primary_key or isinstance(field, JSONField):
+                continue
+            
+            if field.unique:
+                self._append_index([field.name], True)
+            elif field.db_index and not isinstance(field, ForeignKey):
+                # Foreign keys have db_index by default, they are only indexed inside Meta.indexes
+                self._append_index([field.name], False)
+        
+        for fields in self.cls._meta.unique_together:
+            self._append_index(list(fields), True)
+            
+        for index in self.cls._meta.indexes:
+            self._append_index(list(index.fields), False)
+    
+    
+    def _make_index_str(self, columns: tuple[str], unique: bool) -> str:
+        unique_str = 'UNIQUE ' if unique else ''
+        
+        return f'CREATE {unique_str}INDEX IF NOT EXISTS ON {self.table_name}({", ".join(columns)});'
+    
+    
     def _send_sql_exec(self, db_fields: list[str]):
         db_fields_str = ', '.join(db_fields)
         
         exec_str = f'CREATE TABLE IF NOT EXISTS {self.table_name}({db_fields_str});'
         
+        if self.table_name not in self.all_tables and len(self.indexes) > 0:
+            indexes_str = ' '.join([
+                self._make_index_str(columns, unique)
+                for columns, unique in self.indexes
+            ])
+            
+            exec_str = f'BEGIN TRANSACTION; {exec_str} {indexes_str} COMMIT;'
+        
         self.immu_client.sqlExec(exec_str)
 
 
@@ -94,13 +151,18 @@ class TableCreator:
             print(f'SUCCESS: table {self.table_name} created')
 
 
-    def create_table(self) -> list[str]:
+    def make_db_fields(self) -> list[str]:
+        if self.db_fields is not None:
+            return self.db_fields
+        
         db_fields = []
         pk = []
         
         for field in self.cls._meta.fields:
             if isinstance(field, ForeignKey):
                 self._make_foreign_key_field(field, db_fields, pk)
+            elif isinstance(field, JSONField) and getattr(field, 'inline', False):
+                db_fields.append(f'__inline_json__{field.attname} BLOB')
             elif isinstance(field, JSONField):
                 self.json_fields.append(field)
             else:
@@ -118,10 +180,26 @@ class TableCreator:
         
         self._verify_pk_null(pk, db_fields)
         
+        self._make_indexes()
+        
+        self.db_fields = db_fields
+        
+        return db_fields + [f'__json__{field.attname}' for field in self.json_fields]
+
+
+    def create_table(self) -> list[str]:
+        self.make_db_fields()
+        db_fields = self.db_fields.copy()
+        
+        self.all_tables = [
+            table[0] for table in 
+            self.immu_client.sqlQuery('SELECT * FROM TABLES();')
+        ]
+        
         self._send_sql_exec(db_fields)
         
         self._make_jsons_fields(db_fields)
         
         self._send_succes_msg()
         
-        return db_fields
\ No newline at end of file
+        return db_fields
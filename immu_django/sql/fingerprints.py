@@ -0,0 +1,69 @@
+import hashlib
+import json
+
+from immu_django.utils import scan_all
+
+
+_SCHEMA_FINGERPRINTS = None
+"""
+Fingerprints of the tables schemas applied inside immudb, loaded once per process
+"""
+
+SCHEMA_FINGERPRINT_PREFIX = '@immu_schema@'
+
+
+def make_schema_fingerprint(db_fields: list[str], indexes: list[tuple[tuple[str], bool]]) -> str:
+    schema = json.dumps({
+        'db_fields': db_fields,
+        'indexes': [[list(columns), unique] for columns, unique in indexes]
+    })
+    
+    return hashlib.sha256(schema.encode()).hexdigest()
+
+
+def _make_fingerprint_key(database: str, table_name: str) -> bytes:
+    return f'{SCHEMA_FINGERPRINT_PREFIX}{database}@{table_name}'.encode()
+
+
+def get_schema_fingerprint(immu_client, database: str, table_name: str) -> str | None:
+    global _SCHEMA_FINGERPRINTS
+    
+    if _SCHEMA_FINGERPRINTS is None:
+        immu_client.useDatabase('jsonsqlfields')
+        _SCHEMA_FINGERPRINTS = {
+            key: value.decode() 
+            for key, value in scan_all(immu_client, SCHEMA_FINGERPRINT_PREFIX.encode()).items()
+        }
+        immu_client.useDatabase(database)
+    
+    return _SCHEMA_FINGERPRINTS.get(_make_fingerprint_key(database, table_name))
+
+
+def reload_schema_fingerprint(immu_client, database: str, table_name: str) -> str | None:
+    """
+        Fingerprint of the table read again from immudb, for tables migrated by another process
+    """
+    
+    key = _make_fingerprint_key(database, table_name)
+    
+    immu_client.useDatabase('jsonsqlfields')
+    value = immu_client.get(key)
+    immu_client.useDatabase(database)
+    
+    fingerprint = value.value.decode() if value is not None else None
+    
+    if _SCHEMA_FINGERPRINTS is not None and fingerprint is not None:
+        _SCHEMA_FINGERPRINTS[key] = fingerprint
+    
+    return fingerprint
+
+
+def set_schema_fingerprint(immu_client, database: str, table_name: str, fingerprint: str):
+    key = _make_fingerprint_key(database, table_name)
+    
+    immu_client.useDatabase('jsonsqlfields')
+    immu_client.set(key, fingerprint.encode())
+    immu_client.useDatabase(database)
+    
+    if _SCHEMA_FINGERPRINTS is not None:
+        _SCHEMA_FINGERPRINTS[key] = fingerprint
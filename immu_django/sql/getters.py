@@ -1,6 +1,9 @@
 import json
 from immu_django.sql.alter import _TableField
+from immu_django.sql.jsons import get_json
 from immu_django.sql.models import SQLERROR, SQLModel
+from immu_django.snapshots import get_active_snapshot
+from immu_django.sql.sessions import get_sql_client
 
 
 class GetWhere:
@@ -13,6 +16,13 @@ class GetWhere:
         self.table_pks = []
         
         self._get_table_columns()
+        
+        # Old pointer columns of json fields moved to inline, only read when the inline column is null
+        self.legacy_json_fields = [
+            field for field in self.table_fields_names 
+            if field.startswith('__json__') 
+            and f'__inline_json__{field.split("__json__", 1)[-1]}' in self.table_fields_names
+        ]
     
     
     def _get_table_columns(self):
@@ -118,17 +128,17 @@ class GetWhere:
         if time_travel is None:
             return ''
         
-        time_travel = ''
+        time_travel_str = []
         
         for key, value in time_travel.items():
             if type(value) == int:
-                time_travel += f'{key.upper()} TX {value}'
+                time_travel_str.append(f'{key.upper()} TX {value}')
             elif type(value) == str:
-                time_travel += f'{key.upper()} {value}'
+                time_travel_str.append(f"{key.upper()} '{value}'")
             else:
                 raise ValueError('Time travel value error')
             
-        time_travel += ' '
+        return ' '.join(time_travel_str)
     
     
     def _make_offset_str(
@@ -137,41 +147,139 @@ class GetWhere:
         offset: int = 0) -> str:
         offset_str = ''
         if limit is not None:
-            offset_str += f'LIMIT {limit}'
+            offset_str += f'LIMIT {limit} '
         if offset is not None:
             offset_str += f'OFFSET {offset}'
         return offset_str  
     
     
+    def _make_select_str(self, columns: list[str] = None) -> str:
+        if columns is None:
+            return '*'
+        
+        return ', '.join(columns)
+    
+    
+    def _get_select_columns(self, fields: list[str] = None) -> list[str]:
+        if fields is None:
+            return self.table_fields_names
+        
+        columns = []
+        
+        for field in fields:
+            if field in self.table_fields_names:
+                columns.append(field)
+            elif f'__inline_json__{field}' in self.table_fields_names:
+                columns.append(f'__inline_json__{field}')
+                
+                if f'__json__{field}' in self.legacy_json_fields:
+                    columns.append(f'__json__{field}')
+            elif f'__json__{field}' in self.table_fields_names:
+                columns.append(f'__json__{field}')
+            else:
+                fg_columns = [
+                    fd for fd in self.table_fields_names 
+                    if fd.startswith(f'{field}__') and fd.endswith('__fg')
+                ]
+                
+                if len(fg_columns) == 0:
+                    raise ValueError(f'{field} is not a field of the table {self.table_name}')
+                
+                columns.extend(fg_columns)
+        
+        return columns
+    
+    
+    def _get_projection(
+        self, only: list[str] = None, 
+        values: list[str] = None, 
+        values_list: list[str] = None) -> tuple[str, list[str] | None]:
+        projections = {
+            'only': only,
+            'values': values,
+            'values_list': values_list
+        }
+        projections = {k: v for k, v in projections.items() if v is not None}
+        
+        if len(projections) > 1:
+            raise ValueError('only, values and values_list cant be used together')
+        
+        if len(projections) == 0:
+            return 'model', None
+        
+        result_type, fields = list(projections.items())[0]
+        fields = list(fields)
+        
+        if result_type == 'only':
+            pks = [pk.split(' ', 1)[0] for pk in self.table_pks]
+            fields = [pk for pk in pks if pk not in fields] + fields
+        
+        return result_type, fields
+    
+    
     def _make_query(
         self, values: dict = None, 
         time_travel: dict = None,
         limit: int = 1_000,
         offset: int = 0,
-        order_by: str = None) -> list[tuple]:
-        query_str = f'SELECT * FROM {self.table_name} ' \
+        order_by: str = None,
+        columns: list[str] = None) -> list[tuple]:
+        snapshot = get_active_snapshot()
+        
+        if snapshot is not None and time_travel is None:
+            time_travel = {'before': snapshot.get_tx_id(self.immu_client, self.db) + 1}
+        
+        query_str = f'SELECT {self._make_select_str(columns)} FROM {self.table_name} ' \
             f'{self._make_time_travel_str(time_travel)} ' \
             f'{self._make_where_str(values)} ' \
             f'{self._make_order_str(order_by)}' \
             f'{self._make_offset_str(limit, offset)}'
         
-        values = self.immu_client.sqlQuery(query_str)
+        if snapshot is not None:
+            return snapshot.get_cached(
+                (self.db, query_str), 
+                lambda: get_sql_client(self.immu_client, self.db).sqlQuery(query_str)
+            )
+        
+        values = get_sql_client(self.immu_client, self.db).sqlQuery(query_str)
         
         return values
     
     
     def _get_json_value(self, item: dict, field: str, value: str):
         name = field.split('__json__', 1)[-1]
+        
+        if value is None:
+            item[name] = {}
+            return
+        
         self.immu_client.useDatabase('jsonsqlfields')
         
-        if value is not None:
-            value = self.immu_client.get(value.encode()).value.decode()
-        else:
-            value = '{}'
+        item[name] = get_json(self.immu_client, value)
         
         self.immu_client.useDatabase(self.db)
         
+    
+    def _get_inline_json_value(self, item: dict, field: str, value: bytes):
+        name = field.split('__inline_json__', 1)[-1]
+        
+        if value is None:
+            # Not migrated rows still have the json inside the old pointer column
+            if f'__json__{name}' in self.legacy_json_fields:
+                item[name] = None
+                return
+            
+            value = '{}'
+        
         item[name] = json.loads(value)
+    
+    
+    def _get_legacy_json_values(self, item: dict, legacy_jsons: dict[str, str]):
+        for field, value in legacy_jsons.items():
+            name = field.split('__json__', 1)[-1]
+            
+            if item.get(name) is None:
+                self._get_json_value(item, field, value)
         
         
     def _get_fg_field(self, fg_fields: dict, field: str, value: str):
@@ -199,33 +307,61 @@ class GetWhere:
             item[name] = fg
     
     
-    def get(
-        self, *, size_limit: int = 1_000, 
-        order_by: str = None, 
-        time_travel: dict = None, 
-        limit: int = 1_000, offset: int = 0,
-        **kwargs) -> list[dict] | dict:
+    def _make_result(
+        self, items: list, size_limit: int,
+        result_type: str, fields: list[str] = None):
+        if result_type == 'values':
+            results = items
+        elif result_type == 'values_list':
+            results = [
+                item if isinstance(item, SQLERROR) 
+                else tuple(item[field] for field in fields)
+                for item in items
+            ]
+        else:
+            results = [
+                SQLModel(
+                    db=self.db,
+                    immu_client=self.immu_client, 
+                    table_name=self.table_name,
+                    pks=self.table_pks, 
+                    **item
+                )
+                for item in items
+            ]
+        
+        if size_limit <= 1:
+            return results[0]
+        
+        return results
+    
+    
+    def _make_items(self, rows: list[tuple], columns: list[str], size_limit: int) -> list[dict | SQLERROR]:
         items = []
         itens_count = 0
         
-        values = self._make_query(kwargs, time_travel, limit, offset, order_by)
-        
-        for value in values:
+        for row in rows:
             if itens_count >= size_limit:
                 break
             
             fg_fields = {}
+            legacy_jsons = {}
             item = {}
             
             try:
-                for field, value in zip(self.table_fields_names, value):
-                    if str(field).startswith('__json__'):
+                for field, value in zip(columns, row):
+                    if str(field) in self.legacy_json_fields:
+                        legacy_jsons[field] = value
+                    elif str(field).startswith('__json__'):
                         self._get_json_value(item, field, value)
+                    elif str(field).startswith('__inline_json__'):
+                        self._get_inline_json_value(item, field, value)
                     elif str(field).endswith('__fg'):
                         self._get_fg_field(fg_fields, field, value)
                     else:
                         item[field] = value
                 
+                self._get_legacy_json_values(item, legacy_jsons)
                 self._get_fg_objs(item, fg_fields)
                 
                 items.append(item)
@@ -233,29 +369,54 @@ class GetWhere:
                 items.append(SQLERROR(str(e)))
             
             itens_count += 1
-            
-        if len(items) <= 0:
-            raise Exception('Cant find any itens')
         
-        if size_limit <= 1:
-            obj = SQLModel(
+        return items
+    
+    
+    def get_page(
+        self, *, time_travel: dict = None, 
+        limit: int = 1_000, offset: int = 0,
+        order_by: str = None, **kwargs) -> list[SQLModel | SQLERROR]:
+        """
+            Rows of one page of the query, an empty list when the page has no rows
+        """
+        
+        columns = self._get_select_columns()
+        rows = self._make_query(kwargs, time_travel, limit, offset, order_by)
+        
+        return [
+            item if isinstance(item, SQLERROR)
+            else SQLModel(
                 db=self.db,
                 immu_client=self.immu_client, 
                 table_name=self.table_name,
                 pks=self.table_pks, 
-                **items[0]
+                **item
             )
-            return obj
-        else:
-            objs = [
-                SQLModel(
-                    db=self.db,
-                    immu_client=self.immu_client, 
-                    table_name=self.table_name,
-                    pks=self.table_pks, 
-                    **item
-                )
-                for item in items
-            ]
-            return objs
-    
\ No newline at end of file
+            for item in self._make_items(rows, columns, limit)
+        ]
+    
+    
+    def get(
+        self, *, size_limit: int = 1_000, 
+        order_by: str = None, 
+        time_travel: dict = None, 
+        limit: int = 1_000, offset: int = 0,
+        only: list[str] = None,
+        values: list[str] = None,
+        values_list: list[str] = None,
+        **kwargs) -> list[SQLModel | dict | tuple] | SQLModel | dict | tuple:
+        result_type, fields = self._get_projection(only, values, values_list)
+        columns = self._get_select_columns(fields)
+        
+        rows = self._make_query(
+            kwargs, time_travel, limit, offset, order_by, 
+            columns if fields is not None else None
+        )
+        
+        items = self._make_items(rows, columns, size_limit)
+            
+        if len(items) <= 0:
+            raise Exception('Cant find any itens')
+        
+        return self._make_result(items, size_limit, result_type, fields)
@@ -0,0 +1,100 @@
+import base64
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+
+from immu_django.key_value.batches import set_all_in_chunks
+from immu_django.key_value.getters import get_obj_data_at_tx, get_or_none
+from immu_django.snapshots import get_active_snapshot
+from immu_django.sql.constants import JSON_CACHE_SIZE, JSON_DEDUPLICATION
+
+
+_JSONS_CACHE = OrderedDict()
+"""
+Decoded content addressed jsons, they never change so they can be shared between reads
+"""
+
+
+def is_json_hash_key(key: str) -> bool:
+    return key.startswith('#')
+
+
+def make_json_hash_key(json_value: bytes) -> str:
+    digest = hashlib.blake2b(json_value, digest_size=16).digest()
+    
+    return f'#{base64.urlsafe_b64encode(digest).decode().rstrip("=")}'
+
+
+def make_json_key(table_name: str, field: str, pk_values: str, json_value: bytes) -> str:
+    if JSON_DEDUPLICATION:
+        return make_json_hash_key(json_value)
+    
+    return f'@{table_name}@{field}@{pk_values}'
+
+
+def _set_cached_json(key: str, value):
+    _JSONS_CACHE[key] = value
+    _JSONS_CACHE.move_to_end(key)
+    
+    while len(_JSONS_CACHE) > JSON_CACHE_SIZE:
+        _JSONS_CACHE.popitem(last=False)
+
+
+def _get_json_at_snapshot(immu_client, key: str, snapshot):
+    tx_id = snapshot.get_tx_id(immu_client, 'jsonsqlfields')
+    
+    obj_data = snapshot.get_cached(
+        ('jsonsqlfields', key.encode(), False),
+        lambda: get_obj_data_at_tx(immu_client, get_or_none(immu_client, key.encode()), tx_id)
+    )
+    
+    if obj_data is None:
+        return {}
+    
+    return json.loads(obj_data.value.decode())
+
+
+def get_json(immu_client, key: str):
+    if not is_json_hash_key(key):
+        snapshot = get_active_snapshot()
+        
+        if snapshot is not None:
+            return _get_json_at_snapshot(immu_client, key, snapshot)
+        
+        return json.loads(immu_client.get(key.encode()).value.decode())
+    
+    if key not in _JSONS_CACHE:
+        _set_cached_json(key, json.loads(immu_client.get(key.encode()).value.decode()))
+    else:
+        _JSONS_CACHE.move_to_end(key)
+    
+    return copy.deepcopy(_JSONS_CACHE[key])
+
+
+def save_jsons(immu_client, jsons: dict[bytes, bytes]):
+    immu_client.useDatabase('jsonsqlfields')
+    
+    hash_keys = [
+        key for key in jsons.keys() 
+        if is_json_hash_key(key.decode()) 
+        and key.decode() not in _JSONS_CACHE
+    ]
+    
+    if len(hash_keys) > 0:
+        saved_keys = immu_client.getAll(hash_keys).keys()
+    else:
+        saved_keys = []
+    
+    new_jsons = {
+        key: value for key, value in jsons.items()
+        if key not in saved_keys
+        and key.decode() not in _JSONS_CACHE
+    }
+    
+    if len(new_jsons) > 0:
+        set_all_in_chunks(immu_client, new_jsons)
+    
+    for key, value in jsons.items():
+        if is_json_hash_key(key.decode()):
+            _set_cached_json(key.decode(), json.loads(value))
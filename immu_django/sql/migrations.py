@@ -0,0 +1,474 @@
+import json
+import os
+
+from django.apps import apps
+from django.utils.timezone import now
+
+from immu_django.exceptions import TableAlterError
+from immu_django.sql.alter import _TableField, get_table_indexes, is_table_empty, make_index_error
+from immu_django.sql.creators import TableCreator
+from immu_django.sql.fingerprints import make_schema_fingerprint, set_schema_fingerprint
+from immu_django.utils import scan_all
+
+
+MIGRATIONS_DIR = 'immu_migrations'
+MIGRATION_APPLIED_PREFIX = '@immu_migration@'
+COLUMN_TYPES_BYTES = {
+    'INTEGER': 8,
+    'BOOLEAN': 1,
+    'FLOAT': 8,
+    'TIMESTAMP': 8
+}
+
+
+def _get_column_bytes(db_atr: str) -> int:
+    db_type = db_atr.split(' ', 1)[0]
+    
+    if '[' in db_type:
+        return int(db_type.split('[', 1)[-1].strip(']'))
+    
+    return COLUMN_TYPES_BYTES.get(db_type, 0)
+
+
+def _get_pks(db_fields: list[str]) -> list[str]:
+    pks_field = [field for field in db_fields if field.startswith('PRIMARY')][0]
+    pks = pks_field.strip('PRIMARY KEY')
+    
+    return list(map(str.strip, pks[1:-1].split(',')))
+
+
+def _make_json_db_field(table_name: str, db_fields: list[str], json_field: str) -> str:
+    json_pk_length = len(table_name) + 1
+    
+    pks = _get_pks(db_fields)
+    for db_field in db_fields:
+        db_name, db_atr = db_field.split(' ', 1)
+        
+        if db_name in pks:
+            json_pk_length += len(db_name) + 1
+            json_pk_length += _get_column_bytes(db_atr) + 1
+    
+    return f'{json_field} VARCHAR[{len(json_field) + 1 + json_pk_length}]'
+
+
+def make_model_state(cls) -> dict:
+    table_creator = TableCreator(cls, None, cls.immu_confs['table_name'])
+    db_fields = table_creator.make_db_fields()
+    
+    return {
+        'model_name': cls.__name__,
+        'database': cls.immu_confs['database'],
+        'db_fields': table_creator.db_fields,
+        'json_fields': [field for field in db_fields if field.startswith('__json__')],
+        'indexes': [[list(columns), unique] for columns, unique in table_creator.indexes],
+        'fingerprint': make_schema_fingerprint(db_fields, table_creator.indexes)
+    }
+
+
+def get_migrations_names(app_label: str) -> list[str]:
+    migrations_path = os.path.join(apps.get_app_config(app_label).path, MIGRATIONS_DIR)
+    
+    if not os.path.isdir(migrations_path):
+        return []
+    
+    return sorted([
+        name[:-len('.json')] for name in os.listdir(migrations_path) 
+        if name.endswith('.json')
+    ])
+
+
+def load_migration(app_label: str, name: str) -> dict:
+    migrations_path = os.path.join(apps.get_app_config(app_label).path, MIGRATIONS_DIR)
+    
+    with open(os.path.join(migrations_path, f'{name}.json')) as migration_file:
+        return json.load(migration_file)
+
+
+class MigrationPlanner:
+    def __init__(self, app_label: str, models: list, questioner = None) -> None:
+        self.app_label = app_label
+        self.models = models
+        self.questioner = questioner
+        
+        self.migrations_path = os.path.join(apps.get_app_config(app_label).path, MIGRATIONS_DIR)
+        self.migrations_names = get_migrations_names(app_label)
+        
+        self.operations = []
+        self.errors = []
+        
+        
+    def _get_last_state(self) -> dict:
+        if len(self.migrations_names) == 0:
+            return {}
+        
+        return load_migration(self.app_label, self.migrations_names[-1])['state']
+    
+    
+    def _ask(self, txt: str) -> bool:
+        if self.questioner is None:
+            return False
+        
+        return self.questioner(txt)
+    
+    
+    def _append_operation(self, operation: str, table_name: str, state: dict, **kwargs):
+        self.operations.append({
+            'operation': operation,
+            'table_name': table_name,
+            'database': state['database'],
+            **kwargs
+        })
+    
+    
+    def _plan_create_table(self, table_name: str, state: dict):
+        columns = [field for field in state['db_fields'] if not field.startswith('PRIMARY')]
+        primary_keys = [field for field in state['db_fields'] if field.startswith('PRIMARY')]
+        
+        # The primary key must be the last entry of the create table
+        db_fields = columns + [
+            _make_json_db_field(table_name, state['db_fields'], json_field)
+            for json_field in state['json_fields']
+        ] + primary_keys
+        
+        self._append_operation('create_table', table_name, state, db_fields=db_fields)
+        
+        for columns, unique in state['indexes']:
+            self._append_operation('create_index', table_name, state, columns=columns, unique=unique)
+            
+            
+    def _plan_fields(self, table_name: str, old_state: dict, state: dict):
+        old_fields = [field for field in old_state['db_fields'] if not field.startswith('PRIMARY')]
+        new_fields = [field for field in state['db_fields'] if not field.startswith('PRIMARY')]
+        
+        removed_fields = [field for field in old_fields if field not in new_fields]
+        added_fields = [field for field in new_fields if field not in old_fields]
+        
+        for db_field in added_fields:
+            db_name, db_atr = db_field.split(' ', 1)
+            is_new = True
+            
+            for old_field in removed_fields:
+                old_name, old_atr = old_field.split(' ', 1)
+                
+                if old_atr == db_atr and self._ask(
+                    f'Did {old_name} changed name for {db_name} inside model {state["model_name"]}:  '
+                ):
+                    self._append_operation(
+                        'rename_column', table_name, state, 
+                        old_name=old_name, new_name=db_name
+                    )
+                    removed_fields.remove(old_field)
+                    is_new = False
+                    break
+            
+            if not is_new:
+                continue
+            
+            if 'NOT NULL' in db_atr or 'AUTO_INCREMENT' in db_atr:
+                self.errors.append(f'{state["model_name"]} ERROR: new field {db_name} must be nullable and not auto incrementable')
+            else:
+                self._append_operation('add_column', table_name, state, db_field=db_field)
+        
+        for old_field in removed_fields:
+            self.errors.append(f'{state["model_name"]} ERROR: field {old_field} cant be removed or modified')
+    
+    
+    def _plan_json_fields(self, table_name: str, old_state: dict, state: dict):
+        new_fields_names = [field.split(' ', 1)[0] for field in state['db_fields']]
+        
+        for json_field in state['json_fields']:
+            if json_field not in old_state['json_fields']:
+                db_field = _make_json_db_field(table_name, state['db_fields'], json_field)
+                self._append_operation('add_column', table_name, state, db_field=db_field)
+        
+        for json_field in old_state['json_fields']:
+            inline_name = f'__inline_json__{json_field.split("__json__", 1)[-1]}'
+            
+            if json_field not in state['json_fields'] and inline_name not in new_fields_names:
+                self.errors.append(f'{state["model_name"]} ERROR: json field {json_field} cant be removed or renamed')
+    
+    
+    def _plan_alter_table(self, table_name: str, old_state: dict, state: dict):
+        old_pks = [field for field in old_state['db_fields'] if field.startswith('PRIMARY')]
+        new_pks = [field for field in state['db_fields'] if field.startswith('PRIMARY')]
+        
+        if old_pks != new_pks:
+            self.errors.append(f'{state["model_name"]} ERROR: primary keys cant be changed')
+        
+        self._plan_fields(table_name, old_state, state)
+        self._plan_json_fields(table_name, old_state, state)
+        
+        for columns, unique in state['indexes']:
+            if [columns, unique] not in old_state['indexes']:
+                self._append_operation('create_index', table_name, state, columns=columns, unique=unique)
+    
+    
+    def _handle_error(self):
+        if len(self.errors) > 0:
+            error = '[\n' + '\n'.join(self.errors)
+            error += '\nNOTE: immudb just can rename fields and ' \
+            'add new fields that inst primary key, not nullable and auto incrementable. ' \
+            'Fields cant be deleted or modify caractericts of a field. ' \
+            'ForeignKey fields cant be changed just append]'
+            raise TableAlterError(error)
+    
+    
+    def plan(self) -> dict:
+        old_states = self._get_last_state()
+        states = {}
+        
+        for model in self.models:
+            table_name = model.immu_confs['table_name']
+            state = make_model_state(model)
+            states[table_name] = state
+            
+            if table_name not in old_states:
+                self._plan_create_table(table_name, state)
+            elif old_states[table_name]['fingerprint'] != state['fingerprint']:
+                self._plan_alter_table(table_name, old_states[table_name], state)
+        
+        self._handle_error()
+        
+        return states
+    
+    
+    def write(self) -> str | None:
+        states = self.plan()
+        
+        if len(self.operations) == 0:
+            return None
+        
+        number = len(self.migrations_names) + 1
+        
+        if number == 1:
+            name = f'{number:04d}_initial'
+        else:
+            name = f'{number:04d}_auto_{now().strftime("%Y%m%d_%H%M")}'
+        
+        os.makedirs(self.migrations_path, exist_ok=True)
+        
+        with open(os.path.join(self.migrations_path, f'{name}.json'), 'w') as migration_file:
+            json.dump({
+                'operations': self.operations,
+                'state': states
+            }, migration_file, indent=4)
+        
+        return name
+
+
+class MigrationExecutor:
+    def __init__(self, immu_client, app_label: str, models: list) -> None:
+        self.immu_client = immu_client
+        self.app_label = app_label
+        self.models = models
+        self.models_names = {model.immu_confs['table_name']: model.__name__ for model in models}
+        
+        self.migrations_names = get_migrations_names(app_label)
+        self.applied = self._get_applied()
+    
+    
+    def _make_applied_key(self, name: str) -> bytes:
+        return f'{MIGRATION_APPLIED_PREFIX}{self.app_label}@{name}'.encode()
+    
+    
+    def _get_applied(self) -> list[str]:
+        prefix = self._make_applied_key('')
+        
+        self.immu_client.useDatabase('jsonsqlfields')
+        
+        return [key.decode().split('@')[-1] for key in scan_all(self.immu_client, prefix).keys()]
+    
+    
+    def _get_table(self, tables: dict, table_name: str) -> dict:
+        """
+            Columns and indexes of a table inside immudb, tables made before the migrations are changed only by the real diff
+        """
+        
+        if table_name not in tables:
+            all_tables = [table[0] for table in self.immu_client.sqlQuery('SELECT * FROM TABLES();')]
+            
+            if table_name in all_tables:
+                columns = self.immu_client.sqlQuery(f"SELECT * FROM COLUMNS('{table_name}');")
+                
+                tables[table_name] = {
+                    'exists': True,
+                    'columns': [_TableField(column).name for column in columns],
+                    'indexes': get_table_indexes(self.immu_client, table_name),
+                    'empty': None
+                }
+            else:
+                tables[table_name] = {'exists': False, 'columns': [], 'indexes': [], 'empty': True}
+        
+        return tables[table_name]
+    
+    
+    def _is_empty(self, table: dict, table_name: str) -> bool:
+        if table['empty'] is None:
+            table['empty'] = is_table_empty(self.immu_client, table_name)
+        
+        return table['empty']
+    
+    
+    def _make_create_table_strs(self, operation: dict, table: dict) -> list[str]:
+        table_name = operation['table_name']
+        
+        if not table['exists']:
+            table['exists'] = True
+            table['columns'] = [field.split(' ', 1)[0] for field in operation['db_fields'] if not field.startswith('PRIMARY')]
+            
+            return [f'CREATE TABLE {table_name}({", ".join(operation["db_fields"])});']
+        
+        operations = []
+        
+        for db_field in operation['db_fields']:
+            db_name, db_atr = db_field.split(' ', 1)
+            
+            if db_field.startswith('PRIMARY') or db_name in table['columns']:
+                continue
+            
+            if 'NOT NULL' in db_atr or 'AUTO_INCREMENT' in db_atr:
+                raise TableAlterError(
+                    f'{table_name} ERROR: field {db_name} is missing inside the existing table and must be nullable ' \
+                    'and not auto incrementable to be added'
+                )
+            
+            table['columns'].append(db_name)
+            operations.append(f'ALTER TABLE {table_name} ADD COLUMN {db_field};')
+        
+        return operations
+    
+    
+    def _make_create_index_strs(self, operation: dict, table: dict) -> list[str]:
+        table_name = operation['table_name']
+        columns, unique = tuple(operation['columns']), operation['unique']
+        
+        # A unique index of the same columns also serves a not unique one
+        for index_columns, index_unique in table['indexes']:
+            if index_columns == columns and (index_unique or not unique):
+                return []
+        
+        if not self._is_empty(table, table_name):
+            raise make_index_error(self.models_names.get(table_name, table_name), table_name, columns)
+        
+        table['indexes'].append((columns, unique))
+        unique_str = 'UNIQUE ' if unique else ''
+        
+        return [f'CREATE {unique_str}INDEX IF NOT EXISTS ON {table_name}({", ".join(columns)});']
+    
+    
+    def _make_operation_strs(self, operation: dict, tables: dict) -> list[str]:
+        table_name = operation['table_name']
+        table = self._get_table(tables, table_name)
+        
+        match operation['operation']:
+            case 'create_table':
+                return self._make_create_table_strs(operation, table)
+            case 'add_column':
+                db_name = operation['db_field'].split(' ', 1)[0]
+                
+                if db_name in table['columns']:
+                    return []
+                
+                table['columns'].append(db_name)
+                return [f'ALTER TABLE {table_name} ADD COLUMN {operation["db_field"]};']
+            case 'rename_column':
+                if operation['old_name'] not in table['columns'] and operation['new_name'] in table['columns']:
+                    return []
+                
+                table['columns'] = [
+                    operation['new_name'] if column == operation['old_name'] else column 
+                    for column in table['columns']
+                ]
+                return [f'ALTER TABLE {table_name} RENAME COLUMN {operation["old_name"]} TO {operation["new_name"]};']
+            case 'create_index':
+                return self._make_create_index_strs(operation, table)
+            case _:
+                raise ValueError(f'Migration operation {operation["operation"]} not allowed')
+    
+    
+    def _apply(self, name: str):
+        migration = load_migration(self.app_label, name)
+        operations_by_db = {}
+        
+        for operation in migration['operations']:
+            operations_by_db.setdefault(operation['database'], []).append(operation)
+        
+        for database, db_operations in operations_by_db.items():
+            self.immu_client.useDatabase(database)
+            
+            tables = {}
+            operations = [
+                operation_str for operation in db_operations 
+                for operation_str in self._make_operation_strs(operation, tables)
+            ]
+            
+            if len(operations) == 0:
+                continue
+            
+            self.immu_client.sqlExec(f"""
+                BEGIN TRANSACTION;
+                    {' '.join(operations)}
+                COMMIT;
+            """)
+        
+        self.immu_client.useDatabase('jsonsqlfields')
+        self.immu_client.set(self._make_applied_key(name), b'1')
+    
+    
+    def _set_fingerprints(self):
+        if len(self.migrations_names) == 0:
+            return
+        
+        states = load_migration(self.app_label, self.migrations_names[-1])['state']
+        
+        for model in self.models:
+            table_name = model.immu_confs['table_name']
+            state = make_model_state(model)
+            
+            if table_name not in states or states[table_name]['fingerprint'] != state['fingerprint']:
+                continue
+            
+            self._check_table(table_name, state)
+            set_schema_fingerprint(self.immu_client, state['database'], table_name, state['fingerprint'])
+    
+    
+    def _check_table(self, table_name: str, state: dict):
+        """
+            Verify that the table has the columns and indexes of the model before it's marked as migrated
+        """
+        
+        self.immu_client.useDatabase(state['database'])
+        table = self._get_table({}, table_name)
+        
+        missing = [
+            field.split(' ', 1)[0] for field in state['db_fields'] + state['json_fields']
+            if not field.startswith('PRIMARY') and field.split(' ', 1)[0] not in table['columns']
+        ]
+        missing += [
+            f'index ({", ".join(columns)})' for columns, unique in state['indexes']
+            if not any(
+                index_columns == tuple(columns) and (index_unique or not unique)
+                for index_columns, index_unique in table['indexes']
+            )
+        ]
+        
+        if len(missing) > 0:
+            raise TableAlterError(
+                f'{state["model_name"]} ERROR: table {table_name} is missing {missing} after the migrations, ' \
+                'run manage.py immu_makemigrations and manage.py immu_migrate'
+            )
+    
+    
+    def migrate(self) -> list[str]:
+        applied = []
+        
+        for name in self.migrations_names:
+            if name in self.applied:
+                continue
+            
+            self._apply(name)
+            applied.append(name)
+        
+        self._set_fingerprints()
+        
+        return applied
@@ -1,6 +1,32 @@
+import hashlib
 import json
+from immu_django.atomics import get_active_atomic
 from immu_django.sql.alter import _TableField
 from immu_django.sql.constants import NOT_FIELDS
+from immu_django.sql.fingerprints import get_schema_fingerprint
+from immu_django.sql.jsons import make_json_key, save_jsons
+from immu_django.sql.sessions import get_sql_client
+
+
+_TABLES_COLUMNS = {}
+"""
+Cache of the table columns used by SQLModel.save by the schema fingerprint of the table, so a migrated table is read again
+"""
+
+
+def _make_snapshot_value(value):
+    if isinstance(value, SQLModel):
+        return tuple(
+            getattr(value, pk.split(' ', 1)[0]) 
+            for pk in value._pks
+        )
+    
+    if isinstance(value, (dict, list)):
+        return hashlib.sha256(
+            json.dumps(value, sort_keys=True, default=str).encode()
+        ).hexdigest()
+    
+    return value
 
 
 class SQLModel:
@@ -14,7 +40,7 @@ class SQLModel:
                 
             USE:
                 You can get and set usin: object.atribute.
-                You can update the table row using the save method.
+                You can update the table row using the save method, only the atributes that changed are sent.
         
             Args:
                 _pks (list[str]): primarys keys of the table,\n
@@ -38,6 +64,8 @@ class SQLModel:
             
         for key, value in kwargs.items():
             setattr(self, f'_{key}', value)
+        
+        self._immu_snapshot = self._make_snapshot()
             
     def __getattr__(self, name):
         if name.startswith("_"):
@@ -70,71 +98,196 @@ class SQLModel:
     def __dir__(self):
         return [k[1:] for k in vars(self) if k.startswith("_")]
     
-    def save(self):
-        """
-            Update the table row with the object atributes
-        """
-        
-        self._immu_client.useDatabase(self._db)
-
-        model_fields = []
-        value_fields = {}
-        
-        tables = self.immu_client.sqlQuery(
-            f"SELECT * FROM COLUMNS('{self._table_name}');"
-        )
-
-        values = {
+    def _get_fields_values(self) -> dict:
+        return {
             k: getattr(self, k) 
             for k in dir(self) 
             if not k.startswith("__") 
             and k not in NOT_FIELDS
         }
+    
+    def _make_snapshot(self) -> dict:
+        return {
+            k: _make_snapshot_value(v) 
+            for k, v in self._get_fields_values().items()
+        }
+    
+    def _get_changed_fields(self, values: dict) -> list[str]:
+        snapshot = getattr(self, '_immu_snapshot', {})
+        
+        return [
+            k for k, v in values.items()
+            if k not in snapshot 
+            or snapshot[k] != _make_snapshot_value(v)
+        ]
+    
+    def _get_table_columns(self) -> list[_TableField]:
+        table_key = (
+            self._db, self._table_name, 
+            get_schema_fingerprint(self._immu_client, self._db, self._table_name)
+        )
+        
+        if table_key not in _TABLES_COLUMNS:
+            tables = self._immu_client.sqlQuery(
+                f"SELECT * FROM COLUMNS('{self._table_name}');"
+            )
+            _TABLES_COLUMNS[table_key] = [_TableField(table) for table in tables]
+        
+        return _TABLES_COLUMNS[table_key]
+    
+    def _get_column_value(self, name: str, values: dict):
+        if name.endswith('__fg'):
+            fg = str(name).split('__')
+            return getattr(values[fg[0]], fg[1])
+        
+        return values[name]
+    
+    def _make_json_key(self, true_name: str, values: dict, json_value: bytes) -> str:
+        field_value = ''
+        for pk in self._pks:
+            name = pk.split(' ', 1)[0]
+            field_value += f'{name}:{self._get_column_value(name, values)}@'
+            
+        return make_json_key(self._table_name, true_name, field_value, json_value)
+    
+    def _make_save_str(
+        self, model_fields: list[str], 
+        value_fields: dict, values: dict, 
+        upsert: bool, number: int | str = '') -> str:
+        for field in model_fields:
+            value_fields[f'{field}{number}'] = value_fields.pop(field)
+        
+        if upsert:
+            model_values_fields = ', '.join([f'@{field}{number}' for field in model_fields])    
+            
+            return f'UPSERT INTO {self._table_name} ({", ".join(model_fields)}) VALUES ({model_values_fields});'
+        
+        set_str = ', '.join([f'{field} = @{field}{number}' for field in model_fields])
+        
+        where_str = []
+        for pk in self._pks:
+            name = pk.split(' ', 1)[0]
+            value_fields[f'{name}{number}'] = self._get_column_value(name, values)
+            where_str.append(f'{name} = @{name}{number}')
         
-        jsons = {}    
+        return f'UPDATE {self._table_name} SET {set_str} WHERE {" AND ".join(where_str)};'
+    
+    def _get_columns_fields_names(self) -> list[str]:
+        """
+            Names of the model fields that have columns inside the table
+        """
+        
+        names = []
+        
+        for table_field in self._get_table_columns():
+            if table_field.name.startswith('__json__'):
+                name = table_field.name.split('__json__', 1)[-1]
+            elif table_field.name.startswith('__inline_json__'):
+                name = table_field.name.split('__inline_json__', 1)[-1]
+            else:
+                name = table_field.name.split('__', 1)[0]
+            
+            if name not in names:
+                names.append(name)
+        
+        return names
+    
+    def _make_save(self, number: int | str = '', fields: list[str] = None) -> dict | None:
+        values = self._get_fields_values()
+        
+        if fields is None:
+            changed_fields = self._get_changed_fields(values)
+        else:
+            changed_fields = list(fields)
+        
+        # Atributes that aren't columns of the table are not saved
+        columns_fields_names = self._get_columns_fields_names()
+        changed_fields = [field for field in changed_fields if field in columns_fields_names]
+        
+        if len(changed_fields) == 0:
+            return None
+        
+        pks_names = [pk.split(' ', 1)[0].split('__', 1)[0] for pk in self._pks]
+        upsert = any(pk in changed_fields for pk in pks_names)
+        
+        if upsert:
+            missing_fields = [field for field in columns_fields_names if field not in values]
+            
+            # The upsert writes the whole row, a row loaded with only would lose the other columns
+            if len(missing_fields) > 0:
+                raise ValueError(
+                    f'Primary key of a row of {self._table_name} loaded without {missing_fields} cant be changed'
+                )
+            
+            changed_fields = list(values.keys())
+        
+        model_fields = []
+        value_fields = {}
+        jsons = {}
+        
+        table_fields_names = [table_field.name for table_field in self._get_table_columns()]
 
-        for table in tables:
-            table_field = _TableField(table)
+        for table_field in self._get_table_columns():
             if table_field.name.startswith('__json__'):
                 true_name = table_field.name.split('__json__', 1)[-1]
                 
-                field_value = ''
-                for pk in self._pks:
-                    name = pk.split(' ', 1)[0]
-                    if name.endswith('__fg'):
-                        fg = str(name).split('__')
-                        value = getattr(values[fg[0]], fg[1])
-                        field_value += f'{name}:{value}@'
-                    else:
-                        field_value += f'{name}:{values[name]}@'
-                    
-                key = f'@{self.table_name}@{true_name}@{field_value}'
+                # The old pointer column of a field moved to inline is no longer written
+                if true_name not in changed_fields \
+                    or f'__inline_json__{true_name}' in table_fields_names:
+                    continue
+                
+                json_value = json.dumps(values[true_name]).encode()
+                key = self._make_json_key(true_name, values, json_value)
                 
                 model_fields.append(table_field.name)
                 value_fields[table_field.name] = key
-                jsons[key.encode()] = json.dumps(values[true_name]).encode()
-            elif table_field.name.endswith('__fg'):
-                fg = str(table_field.name).split('__')
+                jsons[key.encode()] = json_value
+            elif table_field.name.startswith('__inline_json__'):
+                true_name = table_field.name.split('__inline_json__', 1)[-1]
+                
+                if true_name not in changed_fields:
+                    continue
                 
                 model_fields.append(table_field.name)
-                value_fields[table_field.name] = getattr(values[fg[0]], fg[1])
-            else:
+                value_fields[table_field.name] = json.dumps(values[true_name]).encode()
+            elif table_field.name.split('__', 1)[0] in changed_fields:
                 model_fields.append(table_field.name)
-                value_fields[table_field.name] = values[table_field.name]
+                value_fields[table_field.name] = self._get_column_value(table_field.name, values)
+        
+        return {
+            'save_string': self._make_save_str(model_fields, value_fields, values, upsert, number),
+            'values': value_fields,
+            'jsons': jsons
+        }
     
-        model_values_fields = ', '.join([f'@{field}' for field in model_fields])    
-        model_fields = ', '.join(model_fields)
+    def save(self):
+        """
+            Update the table row with the atributes of the object that changed since it was loaded or saved.\n
+            If a primary key changed the whole row is saved as a new row
+        """
         
-        upsert_str = f'UPSERT INTO {self._table_name} ({model_fields}) VALUES ({model_values_fields});'
-        resp = self._immu_client.sqlExec(upsert_str, value_fields)
+        self._immu_client.useDatabase(self._db)
         
-        if len(jsons) > 0:
-            self.immu_client.useDatabase('jsonsqlfields')
-            resp = self.immu_client.setAll(jsons)
+        atomic = get_active_atomic()
         
-        self._immu_client.useDatabase(self._db)
+        save = self._make_save(atomic.next_number() if atomic is not None else '')
+        
+        if save is None:
+            return
+        
+        if atomic is not None:
+            atomic.add_sql(self._db, save['save_string'], save['values'], save['jsons'])
+            self._immu_snapshot = self._make_snapshot()
+            return
+        
+        # The jsons are saved first, so the row never points to a missing json
+        if len(save['jsons']) > 0:
+            save_jsons(self._immu_client, save['jsons'])
+            self._immu_client.useDatabase(self._db)
+        
+        get_sql_client(self._immu_client, self._db).sqlExec(save['save_string'], save['values'])
         
-        print(f'Model {self.__str__()} updated')
+        self._immu_snapshot = self._make_snapshot()
 
 
 class SQLERROR:
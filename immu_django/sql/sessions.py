@@ -0,0 +1,178 @@
+from contextvars import ContextVar
+import threading
+import time
+
+from django.conf import settings
+from immudb.datatypes import TxMode
+
+from immu_django.connection import make_client
+from immu_django.sql.constants import SQL_SESSIONS_KEEPALIVE, SQL_SESSIONS_POOL_SIZE
+
+
+class ImmuSQLSession:
+    def __init__(self, database: str) -> None:
+        """
+            INFO:
+                Interactive sql session of immudb with its own client, the transaction state is kept by the server.
+            
+            USE:
+                Use 'immu_sql_session' context to take a session of the pool,\n
+                the sql reads and writes of the models of the database inside the context use the session transaction.
+            
+            Args:
+                database (str): database of the session
+        """
+        
+        self.database = database
+        self.client = make_client()
+        self.session = self.client.openSession(
+            getattr(settings, 'IMMU_USER', 'immudb'),
+            getattr(settings, 'IMMU_PASSWORD', 'immudb'),
+            database
+        )
+        self.tx = None
+        self.last_used = time.monotonic()
+    
+    def keep_alive(self):
+        """
+            Keep alive the session if it was not used for more than IMMU_SQL_SESSIONS_KEEPALIVE seconds
+        """
+        
+        if time.monotonic() - self.last_used > SQL_SESSIONS_KEEPALIVE:
+            self.client.keepAlive()
+        
+        self.last_used = time.monotonic()
+    
+    def begin(self, read_only: bool = False):
+        self.tx = self.session.newTx(TxMode.ReadOnly if read_only else TxMode.ReadWrite)
+    
+    def commit(self):
+        self.tx = None
+        self.last_used = time.monotonic()
+        
+        return self.session.commit()
+    
+    def rollback(self):
+        self.tx = None
+        self.last_used = time.monotonic()
+        
+        return self.session.rollback()
+    
+    def sqlExec(self, stmt: str, params: dict = {}):
+        return self.tx.sqlExec(stmt, params)
+    
+    def sqlQuery(self, query: str, params: dict = {}):
+        return self.tx.sqlQuery(query, params)
+    
+    def close(self):
+        try:
+            self.client.closeSession()
+        finally:
+            self.client.shutdown()
+
+
+class SessionPool:
+    def __init__(self, size: int = SQL_SESSIONS_POOL_SIZE) -> None:
+        """
+            INFO:
+                Idle sql sessions by database, reused so the sessions are only opened once.
+            
+            Args:
+                size (int): max number of idle sessions of each database
+        """
+        
+        self.size = size
+        self.sessions = {}
+        self.lock = threading.Lock()
+    
+    def acquire(self, database: str) -> ImmuSQLSession:
+        while True:
+            with self.lock:
+                sessions = self.sessions.get(database, [])
+                session = sessions.pop() if len(sessions) > 0 else None
+            
+            if session is None:
+                return ImmuSQLSession(database)
+            
+            # Sessions closed by the server are dropped
+            try:
+                session.keep_alive()
+            except Exception:
+                self.discard(session)
+            else:
+                return session
+    
+    def release(self, session: ImmuSQLSession):
+        with self.lock:
+            sessions = self.sessions.setdefault(session.database, [])
+            
+            if len(sessions) < self.size:
+                sessions.append(session)
+                return
+        
+        self.discard(session)
+    
+    def discard(self, session: ImmuSQLSession):
+        try:
+            session.close()
+        except Exception:
+            pass
+    
+    def close(self):
+        with self.lock:
+            sessions = [session for database in self.sessions.values() for session in database]
+            self.sessions = {}
+        
+        for session in sessions:
+            self.discard(session)
+
+
+sessions_pool = SessionPool()
+
+
+_ACTIVE_SESSION = ContextVar('immu_sql_session', default=None)
+"""
+Session of the active 'immu_sql_session' context
+"""
+
+
+def get_active_session() -> ImmuSQLSession | None:
+    return _ACTIVE_SESSION.get()
+
+
+def set_active_session(session: ImmuSQLSession | None):
+    return _ACTIVE_SESSION.set(session)
+
+
+def reset_active_session(token):
+    _ACTIVE_SESSION.reset(token)
+
+
+def get_sql_client(immu_client, database: str):
+    """
+        Session of the database if it's inside an 'immu_sql_session' context, otherwise the client
+    """
+    
+    session = get_active_session()
+    
+    if session is not None and session.database == database:
+        return session
+    
+    return immu_client
+
+
+def sql_exec_in_transaction(immu_client, database: str, statements: str, values: dict):
+    """
+        Execute the statements inside one transaction, the session transaction if it's inside an 'immu_sql_session' context
+    """
+    
+    session = get_active_session()
+    
+    if session is not None and session.database == database:
+        return session.sqlExec(statements, values)
+    
+    return immu_client.sqlExec(f"""
+        BEGIN TRANSACTION;
+            {statements}
+        COMMIT;
+    """, values)
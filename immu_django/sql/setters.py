@@ -1,5 +1,7 @@
 import json
+from immu_django.sql.jsons import make_json_key
 from immu_django.sql.models import SQLModel
+from immu_django.sql.sessions import get_sql_client
 from immu_django.utils import lowercase_and_add_space
 from django.apps import apps
 from django.db import DEFAULT_DB_ALIAS, connections
@@ -10,14 +12,16 @@ from django.db.models.fields.related import ForeignKey
 connection = connections[DEFAULT_DB_ALIAS]
 
 class InsertMaker:
-    def __init__(self, cls, db: str, table_name: str, immu_client, number: int = 0) -> None:
+    def __init__(self, cls, db: str, table_name: str, immu_client, number: int = 0, increment: int = None) -> None:
         self.db = db
         self.cls = cls
         self.immu_client = immu_client
         
         self.table_name = table_name
         
+        # The number is the suffix of the params, the increment is the offset of the auto increment field
         self.number = number
+        self.increment = increment if increment is not None else number
         
         self._clean_class()
         
@@ -26,6 +30,7 @@ class InsertMaker:
         self.model_fields = []
         self.value_fields = []
         self.json_fields = []
+        self.inline_json_fields = []
         self.fg_fields = []
         self.pk_fields = []
         self.pks = []
@@ -66,6 +71,13 @@ class InsertMaker:
     
     
     def _get_class_json_field(self, field):
+        if getattr(field, 'inline', False):
+            self.inline_json_fields.append(field.attname)
+            
+            self.model_fields.append(f'__inline_json__{field.name}')
+            self.value_fields.append(f'@__inline_json__{field.name}{self.number}')
+            return
+        
         self.json_fields.append(field.attname)
         
         self.model_fields.append(f'__json__{field.name}')
@@ -91,8 +103,11 @@ class InsertMaker:
                 self._get_class_json_field(field)
                 
                 key = f'{field.name}'
-                self.json_keys[key] = {}
-                self.sql_values[key] = {}
+                if key in self.inline_json_fields:
+                    self._get_inline_json_value(key, {})
+                else:
+                    self.json_keys[key] = {}
+                    self.sql_values[key] = {}
                 continue
             
             if field.name not in kwargs.keys() and not isinstance(field, AutoField):
@@ -111,6 +126,11 @@ class InsertMaker:
         self.sql_values[key] = value
         
     
+    def _get_inline_json_value(self, key: str, value: dict):
+        self.values[f'__inline_json__{key}{self.number}'] = json.dumps(value).encode()
+        self.sql_values[key] = value
+        
+    
     def _get_fg_value(self, key: str, value: object):
         field_model = [field for field in self.cls._meta.fields if field.name == key][0].target_field.model
         
@@ -150,6 +170,8 @@ class InsertMaker:
         for key, value in kwargs.items():
             if key in self.json_fields:
                 self._get_json_value(key, value)
+            elif key in self.inline_json_fields:
+                self._get_inline_json_value(key, value)
             elif key in self.fg_fields:
                 self._get_fg_value(key, value)
             else:
@@ -158,15 +180,18 @@ class InsertMaker:
         
     def _make_autoincrement_value_field(self):
         if self.auto_increment_field is not None:
-            res = self.immu_client.sqlQuery(
+            # Inside a sql session the rows inserted by the session are seen
+            res = get_sql_client(self.immu_client, self.db).sqlQuery(
                 f'SELECT MAX({self.auto_increment_field}) FROM {self.table_name}'
             )
-            self.values[f'{self.auto_increment_field}{self.number}'] = int(res[0][0]) + 1 + self.number
+            value = int(res[0][0]) + 1 + self.increment
+            
+            self.values[f'{self.auto_increment_field}{self.number}'] = value
             
-            self.sql_values[self.auto_increment_field] = int(res[0][0]) + 1 + self.number
+            self.sql_values[self.auto_increment_field] = value
             
             if self.auto_increment_field in self.pk_fields:
-                self.pk_values[self.auto_increment_field] = int(res[0][0]) + 1 + self.number
+                self.pk_values[self.auto_increment_field] = value
  
         
     def _make_insert_string(self) -> str:
@@ -186,10 +211,11 @@ class InsertMaker:
                 field_value += f'{key}:{value}@'
 
             field_name = f'__json__{field}'
+            json_value = json.dumps(self.json_keys[field]).encode()
             
-            key = f'@{self.table_name}@{field}@{field_value}'
+            key = make_json_key(self.table_name, field, field_value, json_value)
             self.values[f'{field_name}{self.number}'] = key
-            self.append_jsons[key.encode()] = json.dumps(self.json_keys[field]).encode()    
+            self.append_jsons[key.encode()] = json_value    
         
         
     def make(self, number: int = None, **kwargs) -> dict:
@@ -1,16 +1,96 @@
-import random
-from django.utils.crypto import get_random_string
+import os
+import threading
+import time
+import uuid
+from django.utils.module_loading import import_string
 from django.db import models
 
+from immu_django.key_value.constants import KEY_GENERATOR
 
-def random_key(immu_client) -> str:
-    random_str = get_random_string(length=random.randint(10, 255))
-    immu_obj = immu_client.get(random_str.encode())
+
+_ULID_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+_KEYS_STATES = {}
+_KEYS_LOCK = threading.Lock()
+
+
+def _next_time_and_random(name: str, random_bits: int) -> tuple[int, int]:
+    """
+        Milliseconds and random bits of a time ordered key, keys made in the same millisecond increment the random bits so they stay ordered
+    """
+    
+    with _KEYS_LOCK:
+        ms = time.time_ns() // 1_000_000
+        last_ms, last_random = _KEYS_STATES.get(name, (0, 0))
+        
+        if ms <= last_ms and last_random + 1 < 1 << random_bits:
+            ms, random_value = last_ms, last_random + 1
+        else:
+            random_value = int.from_bytes(os.urandom(random_bits // 8 + 1), 'big') >> (8 - random_bits % 8)
+            
+        _KEYS_STATES[name] = (ms, random_value)
+        
+    return ms, random_value
+
+
+def make_ulid() -> str:
+    ms, random_value = _next_time_and_random('ulid', 80)
+    value = (ms << 80) | random_value
+    
+    return ''.join(_ULID_ALPHABET[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+
+def make_uuid7() -> str:
+    ms, random_value = _next_time_and_random('uuid7', 74)
+    value = (ms << 80) | (7 << 76) | ((random_value >> 62) << 64) | (2 << 62) | (random_value & ((1 << 62) - 1))
+    
+    return str(uuid.UUID(int=value))
+
+
+KEY_GENERATORS = {
+    'ulid': make_ulid,
+    'uuid7': make_uuid7
+}
+
+
+def make_key(prefix: str = '') -> str:
+    """
+        INFO:
+            Make a new key using the IMMU_KEY_GENERATOR of the settings.
+            
+        USE:
+            The keys are time ordered and have the same size, so new keys are near inside the scans and they never collide.\n
+            IMMU_KEY_GENERATOR can be 'ulid', 'uuid7' or the dotted path of a function without args that returns a str.
+        
+        Args:
+            prefix (str): prefix of the key
+            
+        Returns:
+            str: the key
+    """
+    
+    if KEY_GENERATOR in KEY_GENERATORS:
+        generator = KEY_GENERATORS[KEY_GENERATOR]
+    else:
+        generator = import_string(KEY_GENERATOR)
     
-    if immu_obj is not None:
-        return random_key()
+    return f'{prefix}{generator()}'
+
 
-    return random_str
+def scan_all(immu_client, prefix: bytes, page_size: int = 1_000) -> dict[bytes, bytes]:
+    objs = {}
+    seek_key = b''
+    
+    while True:
+        scan = immu_client.scan(seek_key, prefix, False, page_size)
+        
+        for key, value in scan.items():
+            objs[key] = value
+            seek_key = key
+        
+        if len(scan) < page_size:
+            break
+    
+    return objs
 
 
 def lowercase_and_add_space(text: str) -> str:
@@ -48,3 +128,31 @@ class ImmuForeignKey(models.ForeignKey):
     def __init__(self, to, **kwargs):
         kwargs.setdefault('on_delete', models.CASCADE)
         super().__init__(to, **kwargs)
+
+
+class ImmuJSONField(models.JSONField):
+    """
+        INFO:
+            Class for 'ImmudbSQL' json atribute that can choose where the json is stored.
+        
+        USE:
+            Put it inside a new model and chose if you want it to be inline.\n
+            Inline json fields are stored inside the table row as a BLOB column, so they are read and written in the same transaction of the row.\n
+            Not inline json fields are stored inside the 'jsonsqlfields' database, like models.JSONField.
+            
+        ALERT:
+            To move the jsons of an existing not inline field to inline use the 'migrate_json_to_inline' method of the model.\n
+            Inline json fields can't be indexed.
+    """
+    
+    def __init__(self, *args, inline: bool = False, **kwargs):
+        self.inline = inline
+        super().__init__(*args, **kwargs)
+        
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        
+        if self.inline:
+            kwargs['inline'] = True
+            
+        return name, path, args, kwargs